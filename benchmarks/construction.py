@@ -0,0 +1,111 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Program construction benchmark for generated stacks.
+
+Declares N ``CustomModelDeployment`` components against Pulumi mocks (no
+engine, no API calls) and reports construction time, time until all mock
+registrations settle, and peak Python memory::
+
+    python -m benchmarks.construction 1000 10000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import pulumi
+import pulumi_datarobot as datarobot
+from pulumi.runtime.stack import wait_for_rpcs
+from pulumi.runtime.sync_await import _sync_await
+
+from infra.common.schema import DeploymentArgs, RegisteredModelArgs
+from infra.components.custom_model_deployment import CustomModelDeployment
+
+
+class _Mocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs) -> Any:
+        return [f"{args.name}-id", {**args.inputs, "versionId": f"{args.name}-v"}]
+
+    def call(self, args: pulumi.runtime.MockCallArgs) -> Any:
+        return {}
+
+
+def _deployment_args(index: int) -> DeploymentArgs:
+    # Fresh but equal settings objects, as a stack generator would produce.
+    return DeploymentArgs(
+        resource_name=f"deployment-{index}",
+        label=f"deployment {index}",
+        predictions_settings=datarobot.DeploymentPredictionsSettingsArgs(
+            min_computes=0, max_computes=1, real_time=True
+        ),
+        drift_tracking_settings=datarobot.DeploymentDriftTrackingSettingsArgs(
+            feature_drift_enabled=False, target_drift_enabled=False
+        ),
+        health_settings=datarobot.DeploymentHealthSettingsArgs(
+            service=datarobot.DeploymentHealthSettingsServiceArgs(batch_count=5)
+        ),
+    )
+
+
+def run(count: int) -> Dict[str, float]:
+    pulumi.runtime.set_mocks(_Mocks(), project="bench", stack="bench", preview=True)
+    tracemalloc.start()
+    start = time.perf_counter()
+    prediction_environment = datarobot.PredictionEnvironment(
+        "prediction-environment", platform="datarobotServerless"
+    )
+    for index in range(count):
+        CustomModelDeployment(
+            f"model-{index}",
+            registered_model_args=RegisteredModelArgs(
+                resource_name=f"registered-model-{index}", name=f"model {index}"
+            ),
+            prediction_environment=prediction_environment,
+            deployment_args=_deployment_args(index),
+            custom_model_version_id=f"version-{index}",
+        )
+    constructed = time.perf_counter()
+    _sync_await(wait_for_rpcs())
+    settled = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "components": count,
+        "construct_seconds": constructed - start,
+        "settle_seconds": settled - start,
+        "per_component_ms": (constructed - start) / count * 1000,
+        "peak_mib": peak / 1024**2,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("counts", nargs="*", type=int, default=[1000, 10000])
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results: List[Dict[str, float]] = [run(count) for count in args.counts]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(
+                f"{result['components']:>6} components: "
+                f"construct {result['construct_seconds']:.2f}s "
+                f"({result['per_component_ms']:.3f} ms each), "
+                f"settled {result['settle_seconds']:.2f}s, "
+                f"peak {result['peak_mib']:.1f} MiB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
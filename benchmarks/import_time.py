@@ -0,0 +1,137 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Cold import time benchmark for the ``infra`` package.
+
+Every module is imported in a fresh interpreter (several times, keeping the
+median) and the heavy third-party packages it pulled in are recorded::
+
+    python -m benchmarks.import_time --output import_times.json
+    python -m benchmarks.import_time --baseline import_times.json
+
+With ``--baseline`` the run exits non-zero if any module got slower than the
+baseline by more than ``--tolerance`` or started loading a heavy dependency
+it did not load before.
+"""
+
+import argparse
+import json
+import pathlib
+import pkgutil
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+import infra
+
+HEAVY_DEPENDENCIES = [
+    "datarobot",
+    "docsassist",
+    "pandas",
+    "pulumi",
+    "pulumi_datarobot",
+    "pydantic",
+    "yaml",
+]
+
+_PROBE = """\
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def infra_modules() -> List[str]:
+    modules = [infra.__name__]
+    for info in pkgutil.walk_packages(infra.__path__, prefix=f"{infra.__name__}."):
+        modules.append(info.name)
+    return sorted(modules)
+
+
+def measure(module: str, repeat: int) -> Dict[str, Any]:
+    root = pathlib.Path(infra.__file__).resolve().parent.parent
+    samples = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES),
+            ],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode:
+            lines = proc.stderr.strip().splitlines()
+            message = lines[-1] if lines else "no output on stderr"
+            return {"error": f"exit code {proc.returncode}: {message}"}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        loaded = result["loaded"]
+    return {"seconds": statistics.median(samples), "loaded": loaded}
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    regressions = []
+    for module, result in results.items():
+        base = baseline.get(module)
+        if not base or "seconds" not in base or "seconds" not in result:
+            continue
+        if result["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{module}: {result['seconds']:.3f}s vs baseline {base['seconds']:.3f}s"
+            )
+        new_deps = set(result["loaded"]) - set(base["loaded"])
+        if new_deps:
+            regressions.append(f"{module}: now imports {', '.join(sorted(new_deps))}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="defaults to every infra module")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=pathlib.Path)
+    parser.add_argument("--baseline", type=pathlib.Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {
+        module: measure(module, args.repeat)
+        for module in args.modules or infra_modules()
+    }
+    for module, result in results.items():
+        if "error" in result:
+            print(f"{module:<50} failed: {result['error']}")
+        else:
+            loaded = ", ".join(result["loaded"])
+            print(f"{module:<50} {result['seconds'] * 1000:8.1f} ms  [{loaded}]")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Prediction latency and throughput benchmark for a deployment.
+
+Sweeps payload row counts and concurrency levels against a live deployment
+and reports latency percentiles, rows per second and error rate for each
+combination::
+
+    python -m benchmarks.prediction 65f... --rows 1 100 1000 --concurrency 1 8 \\
+        --output v1.json
+    python -m benchmarks.prediction 65f... --baseline v1.json
+
+Payloads are sampled from ``--payload`` (a CSV of real rows) or built from
+the deployment's feature list. With ``--baseline`` the run exits non-zero
+if p95 latency or throughput of any combination regressed by more than
+``--tolerance``, or its error rate grew by more than ``--error-tolerance``.
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import datarobot as dr
+import pandas as pd
+
+from infra.common.keep_warm import synthetic_payload
+from infra.common.prediction_client import AsyncPredictionClient
+from infra.common.readiness import wait_until_ready
+
+
+def make_payload(base: pd.DataFrame, rows: int) -> pd.DataFrame:
+    return base.sample(rows, replace=len(base) < rows, random_state=0)
+
+
+async def run_cell(
+    deployment_id: str, payload: pd.DataFrame, concurrency: int, requests: int
+) -> Dict[str, Any]:
+    body = payload.to_csv(index=False)
+    async with AsyncPredictionClient(max_concurrency=concurrency) as client:
+        client.endpoint(deployment_id)
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(client.predict(deployment_id, body) for _ in range(requests)),
+            return_exceptions=True,
+        )
+        seconds = time.perf_counter() - start
+        summary = client.latency_summary()
+    succeeded = sum(not isinstance(outcome, BaseException) for outcome in outcomes)
+    return {
+        "rows": len(payload),
+        "concurrency": concurrency,
+        "requests": requests,
+        "seconds": seconds,
+        "rows_per_second": succeeded * len(payload) / seconds,
+        "error_rate": (requests - succeeded) / requests,
+        **{f"{q}_seconds": summary.get(q) for q in ("p50", "p95", "p99")},
+    }
+
+
+async def probe(deployment_id: str, payload: pd.DataFrame) -> None:
+    async with AsyncPredictionClient(max_concurrency=1) as client:
+        await client.predict(deployment_id, payload)
+
+
+def run(
+    deployment_id: str,
+    rows: List[int],
+    concurrency: List[int],
+    requests: int,
+    payload: Optional[pd.DataFrame] = None,
+) -> Dict[str, Dict[str, Any]]:
+    base = payload if payload is not None else synthetic_payload(deployment_id)
+    # Measure serving, not the cold start.
+    readiness = wait_until_ready(
+        deployment_id,
+        probe=lambda i: asyncio.run(probe(i, make_payload(base, 1))),
+    )
+    if not readiness.ready:
+        raise RuntimeError(f"Deployment {deployment_id} not ready: {readiness.error}")
+    results = {}
+    for row_count in rows:
+        for level in concurrency:
+            results[f"rows={row_count},concurrency={level}"] = asyncio.run(
+                run_cell(deployment_id, make_payload(base, row_count), level, requests)
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+    error_tolerance: float,
+) -> List[str]:
+    regressions = []
+    for cell, result in results.items():
+        base = baseline.get(cell)
+        if not base:
+            continue
+        if (
+            result["p95_seconds"] is not None
+            and base["p95_seconds"] is not None
+            and result["p95_seconds"] > base["p95_seconds"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{cell}: p95 {result['p95_seconds']:.3f}s vs baseline "
+                f"{base['p95_seconds']:.3f}s"
+            )
+        if result["rows_per_second"] < base["rows_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{cell}: {result['rows_per_second']:.0f} rows/s vs baseline "
+                f"{base['rows_per_second']:.0f} rows/s"
+            )
+        if result["error_rate"] > base["error_rate"] + error_tolerance:
+            regressions.append(
+                f"{cell}: error rate {result['error_rate']:.1%} vs baseline "
+                f"{base['error_rate']:.1%}"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("deployment_id")
+    parser.add_argument("--rows", nargs="+", type=int, default=[1, 100, 1000])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=50, help="per combination")
+    parser.add_argument("--payload", type=pathlib.Path, help="CSV of sample rows")
+    parser.add_argument("--output", type=pathlib.Path)
+    parser.add_argument("--baseline", type=pathlib.Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--error-tolerance", type=float, default=0.01)
+    args = parser.parse_args()
+
+    dr.Client()
+    payload = pd.read_csv(args.payload) if args.payload else None
+    results = run(
+        args.deployment_id, args.rows, args.concurrency, args.requests, payload
+    )
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.baseline:
+        regressions = compare(
+            results,
+            json.loads(args.baseline.read_text()),
+            args.tolerance,
+            args.error_tolerance,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
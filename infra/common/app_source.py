@@ -0,0 +1,114 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Incremental uploads of an application source folder.
+
+``sync_application_source`` keeps a per-file hash index of what the last
+synced version of an application source contains. A new version is based
+on that version, and only added or changed files are uploaded and removed
+files deleted, so a one-line change to ``app.py`` ships one file.
+"""
+
+import contextlib
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import datarobot as dr
+from requests_toolbelt import MultipartEncoder
+
+from . import cache
+from .manifest import ContentManifest
+
+_CACHE_NAMESPACE = "app_sources"
+_SOURCES_PATH = "customApplicationSources/{}/versions/"
+
+
+@dataclass
+class AppSourceDiff:
+    upload: List[str] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.upload or self.delete)
+
+
+def diff_index(previous: Dict[str, str], current: Dict[str, str]) -> AppSourceDiff:
+    """Compare two ``{remote_path: sha256}`` indexes."""
+    return AppSourceDiff(
+        upload=sorted(
+            path for path, sha in current.items() if previous.get(path) != sha
+        ),
+        delete=sorted(path for path in previous if path not in current),
+    )
+
+
+def _version_items(
+    client: dr.rest.RESTClientObject, source_id: str, version_id: str
+) -> Dict[str, str]:
+    path = f"{_SOURCES_PATH.format(source_id)}{version_id}/"
+    items = client.get(path).json().get("items", [])
+    return {item["filePath"]: item["id"] for item in items}
+
+
+def sync_application_source(
+    application_source_id: str,
+    folder_path: str,
+    base_version_id: Optional[str] = None,
+    client: Optional[dr.rest.RESTClientObject] = None,
+) -> Tuple[str, AppSourceDiff]:
+    """Create a version of an application source containing ``folder_path``.
+
+    The new version starts from ``base_version_id`` (default: the version
+    this function last produced for the source) and only receives the
+    changed files. If nothing changed since that version, no version is
+    created and its id is returned. Without a local index every file is
+    uploaded and files in the base version that no longer exist locally are
+    deleted.
+    """
+    client = client or dr.client.get_client()
+    index_path = cache.cache_dir(_CACHE_NAMESPACE) / (
+        cache.cache_key(client.endpoint, application_source_id) + ".json"
+    )
+    index: Dict[str, Any] = cache.read_json(index_path) or {}
+    manifest = ContentManifest(folder_path=folder_path)
+    current = {entry["remote"]: entry["sha256"] for entry in manifest.entries.values()}
+    local_paths = {entry["remote"]: local for local, entry in manifest.entries.items()}
+
+    known = base_version_id is None or base_version_id == index.get("version_id")
+    previous: Dict[str, str] = index.get("files", {}) if known else {}
+    base_version_id = base_version_id or index.get("version_id")
+    diff = diff_index(previous, current)
+    if base_version_id and known and not diff:
+        return base_version_id, diff
+
+    versions_path = _SOURCES_PATH.format(application_source_id)
+    payload = {"baseVersion": base_version_id} if base_version_id else {}
+    version_id = client.post(versions_path, json=payload).json()["id"]
+
+    item_ids = _version_items(client, application_source_id, version_id)
+    if not known:
+        diff.delete = sorted(path for path in item_ids if path not in current)
+    to_delete = [item_ids[path] for path in diff.delete if path in item_ids]
+
+    if diff:
+        with contextlib.ExitStack() as stack:
+            fields: List[Tuple[str, Any]] = []
+            for path in diff.upload:
+                f = stack.enter_context(open(local_paths[path], "rb"))
+                fields.append(("file", (os.path.basename(path), f)))
+                fields.append(("filePath", path))
+            fields.extend(("filesToDelete", item_id) for item_id in to_delete)
+            encoder = MultipartEncoder(fields=fields)
+            client.patch(
+                f"{versions_path}{version_id}/",
+                data=encoder,
+                headers={"Content-Type": encoder.content_type},
+            )
+
+    cache.write_json(index_path, {"version_id": version_id, "files": current})
+    return version_id, diff
@@ -0,0 +1,180 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Scoring of whole datasets against a deployment.
+
+``score`` takes a DataFrame or a CSV/Parquet path and yields prediction
+DataFrames in input order, indexed like the input rows. Small inputs are
+split into chunks of bounded size and scored with parallel realtime
+requests; large ones go through the batch prediction API, whose output is
+streamed back from disk. Neither path holds more than a few chunks of the
+input or the predictions in memory (except the input DataFrame itself)::
+
+    predictions = pd.concat(score(deployment_id, "holdout.parquet"))
+"""
+
+import collections
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, Literal, Optional, Union
+
+import datarobot as dr
+import pandas as pd
+from datarobot_predict.deployment import predict
+
+ScoringInput = Union[pd.DataFrame, str, "os.PathLike[str]"]
+
+# Realtime prediction requests are limited to 50 MB.
+DEFAULT_MAX_CHUNK_BYTES = 10 * 1024**2
+BATCH_THRESHOLD_BYTES = 100 * 1024**2
+_SAMPLE_ROWS = 1000
+
+
+def _rows_per_chunk(sample: pd.DataFrame, max_chunk_bytes: int) -> int:
+    if sample.empty:
+        return 1
+    csv_bytes = len(sample.to_csv(index=False).encode())
+    return max(1, int(max_chunk_bytes * len(sample) // csv_bytes))
+
+
+def _is_parquet(path: str) -> bool:
+    return path.endswith((".parquet", ".pq"))
+
+
+def iter_chunks(
+    data: ScoringInput, max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES
+) -> Iterator[pd.DataFrame]:
+    """Split a DataFrame, CSV or Parquet file into chunks of about ``max_chunk_bytes`` as CSV.
+
+    Files are read incrementally; chunk indexes continue across chunks.
+    """
+    if isinstance(data, pd.DataFrame):
+        rows = _rows_per_chunk(data.head(_SAMPLE_ROWS), max_chunk_bytes)
+        for start in range(0, len(data), rows):
+            yield data.iloc[start : start + rows]
+        return
+
+    path = os.fspath(data)
+    offset = 0
+    if _is_parquet(path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("pyarrow is required to score Parquet files") from e
+        parquet = pq.ParquetFile(path)
+        sample = next(parquet.iter_batches(batch_size=_SAMPLE_ROWS), None)
+        if sample is None:
+            return
+        rows = _rows_per_chunk(sample.to_pandas(), max_chunk_bytes)
+        batches = (batch.to_pandas() for batch in parquet.iter_batches(rows))
+    else:
+        rows = _rows_per_chunk(pd.read_csv(path, nrows=_SAMPLE_ROWS), max_chunk_bytes)
+        batches = pd.read_csv(path, chunksize=rows)
+    for chunk in batches:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def _input_bytes(data: ScoringInput) -> int:
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+    return os.path.getsize(data)
+
+
+def score_realtime(
+    deployment_id: str,
+    data: ScoringInput,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    max_workers: int = 4,
+    predict_fn: Optional[Callable[..., Any]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Score ``data`` with parallel realtime requests, yielding results in order.
+
+    ``predict_fn`` defaults to ``datarobot_predict.deployment.predict`` and
+    is called as ``predict_fn(deployment, data_frame=chunk)``.
+    """
+    deployment = dr.Deployment.get(deployment_id)
+    predict_fn = predict_fn or predict
+
+    def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+        predictions = predict_fn(deployment, data_frame=chunk).dataframe
+        predictions.index = chunk.index
+        return predictions
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Bound the chunks in flight so memory does not grow with the input.
+        pending: Deque[Future[pd.DataFrame]] = collections.deque()
+        for chunk in iter_chunks(data, max_chunk_bytes):
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_batch(
+    deployment_id: str,
+    data: ScoringInput,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    **score_kwargs: Any,
+) -> Iterator[pd.DataFrame]:
+    """Score ``data`` with a batch prediction job, streaming the results back.
+
+    Extra keyword arguments are passed to ``dr.BatchPredictionJob.score``.
+    Predictions of a DataFrame carry its index, mapped back by row position.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if isinstance(data, pd.DataFrame):
+            intake: Any = data
+        elif _is_parquet(os.fspath(data)):
+            # Batch prediction intake takes CSV; convert without loading it all.
+            intake = os.path.join(tmp, "intake.csv")
+            for index, chunk in enumerate(iter_chunks(data, max_chunk_bytes)):
+                chunk.to_csv(intake, mode="a", header=index == 0, index=False)
+        else:
+            intake = os.fspath(data)
+        output = os.path.join(tmp, "predictions.csv")
+        dr.BatchPredictionJob.score(
+            deployment_id,
+            intake_settings={"type": "localFile", "file": intake},
+            output_settings={"type": "localFile", "path": output},
+            **score_kwargs,
+        )
+        for chunk in iter_chunks(output, max_chunk_bytes):
+            if isinstance(data, pd.DataFrame):
+                # Output rows follow the input rows; the chunk index is their position.
+                chunk.index = data.index.take(chunk.index)
+            yield chunk
+
+
+def score(
+    deployment_id: str,
+    data: ScoringInput,
+    method: Literal["auto", "realtime", "batch"] = "auto",
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    max_workers: int = 4,
+    predict_fn: Optional[Callable[..., Any]] = None,
+    batch_options: Optional[Dict[str, Any]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Score ``data`` against a deployment, yielding prediction chunks in input order.
+
+    ``auto`` uses the batch prediction API for inputs above
+    ``BATCH_THRESHOLD_BYTES`` and parallel realtime requests otherwise.
+    ``max_workers`` and ``predict_fn`` apply to realtime scoring (see
+    ``score_realtime``) and ``batch_options`` to batch scoring (see
+    ``score_batch``); options of the path not taken are ignored, so one call
+    can configure both for ``auto``.
+    """
+    if method == "auto":
+        method = "batch" if _input_bytes(data) > BATCH_THRESHOLD_BYTES else "realtime"
+    if method == "batch":
+        return score_batch(
+            deployment_id, data, max_chunk_bytes, **(batch_options or {})
+        )
+    return score_realtime(deployment_id, data, max_chunk_bytes, max_workers, predict_fn)
@@ -0,0 +1,76 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Small on-disk JSON cache shared by the infra helpers.
+
+Entries live under ``$DATAROBOT_PULUMI_CACHE_DIR`` (default
+``~/.cache/pulumi-datarobot``) so that they survive between short-lived
+``pulumi preview``/``pulumi up`` invocations.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+from typing import Any, Optional
+
+CACHE_DIR_ENV = "DATAROBOT_PULUMI_CACHE_DIR"
+
+
+def cache_dir(*parts: str) -> pathlib.Path:
+    """Return (and create) a directory inside the infra cache root."""
+    root = os.environ.get(CACHE_DIR_ENV)
+    base = (
+        pathlib.Path(root)
+        if root
+        else pathlib.Path.home() / ".cache" / "pulumi-datarobot"
+    )
+    path = base.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable hex digest of JSON-serializable key parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def read_json(path: pathlib.Path, ttl: Optional[float] = None) -> Any:
+    """Read a cached JSON document, or None if missing, corrupt or stale.
+
+    ``ttl`` is measured in seconds against the file modification time;
+    ``None`` means the entry never expires.
+    """
+    try:
+        if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: pathlib.Path, data: Any) -> None:
+    """Atomically write a JSON document so concurrent readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        pathlib.Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def clear(*parts: str) -> None:
+    """Remove a cache directory and everything in it."""
+    shutil.rmtree(cache_dir(*parts), ignore_errors=True)
@@ -0,0 +1,325 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Offline estimates of vector database chunking.
+
+Applies the chunking method of a ``ChunkingParameters`` (only ``recursive``
+can be simulated; others are rejected) to the corpus behind a
+``DatasetArgs.file_path`` or an ingested document directory locally and reports chunk counts,
+the chunk token distribution and the expected embedding time and cost, so
+chunking parameters can be compared without building vector databases::
+
+    python -m infra.common.chunking corpus.zip --chunk-size 256 384 512 \\
+        --overlap 0 10 20
+
+Tokens are counted with ``tiktoken`` when it is installed and estimated from
+words and punctuation otherwise; either way the numbers approximate the
+embedding model's own tokenizer. The corpus is read once for all
+settings; pieces are token-counted in batches per separator level and
+chunk windows are found by searching cumulative token counts with numpy.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+import zipfile
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .manifest import list_files
+from .schema import ChunkingParameters
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+# Rough embedding throughput (tokens per second) on DataRobot's default
+# embedding workers. Calibrate with ``tokens_per_second`` for real numbers.
+EMBEDDING_TOKENS_PER_SECOND: Dict[str, float] = {
+    "intfloat/e5-large-v2": 2_500,
+    "intfloat/e5-base-v2": 7_500,
+    "intfloat/multilingual-e5-base": 7_000,
+    "sentence-transformers/all-MiniLM-L6-v2": 25_000,
+    "jinaai/jina-embedding-t-en-v1": 30_000,
+    "cl-nagoya/sup-simcse-ja-base": 7_000,
+}
+DEFAULT_EMBEDDING_MODEL = "jinaai/jina-embedding-t-en-v1"
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+# Subword tokenizers split roughly one in three words in English prose.
+_TOKENS_PER_WORD = 1.3
+
+TokenCounter = Callable[[List[str]], np.ndarray]
+
+
+def token_counter(encoding: str = "cl100k_base") -> TokenCounter:
+    """Return a batch token counter, using ``tiktoken`` when available."""
+    if tiktoken is not None:
+        tokenizer = tiktoken.get_encoding(encoding)
+
+        def count(pieces: List[str]) -> np.ndarray:
+            encoded = tokenizer.encode_ordinary_batch(pieces)
+            return np.fromiter(map(len, encoded), dtype=np.int64, count=len(pieces))
+
+        return count
+
+    def estimate(pieces: List[str]) -> np.ndarray:
+        words = np.fromiter(
+            (len(_WORD_PATTERN.findall(piece)) for piece in pieces),
+            dtype=np.float64,
+            count=len(pieces),
+        )
+        return np.ceil(words * _TOKENS_PER_WORD).astype(np.int64)
+
+    return estimate
+
+
+def load_documents(file_path: str) -> List[str]:
+    """Read the text documents of a corpus.
+
+    Zip archives and directories (walked like a ``ContentManifest``)
+    contribute one document per UTF-8 text file; binary files (PDF,
+    DOCX...) are skipped because they are extracted server-side. Any other
+    file is read as a single document.
+    """
+    documents = []
+    if os.path.isdir(file_path):
+        for local, _ in list_files(folder_path=file_path):
+            try:
+                with open(local, encoding="utf-8") as f:
+                    documents.append(f.read())
+            except UnicodeDecodeError:
+                continue
+        return documents
+    if not zipfile.is_zipfile(file_path):
+        with open(file_path, encoding="utf-8", errors="replace") as f:
+            return [f.read()]
+    with zipfile.ZipFile(file_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            try:
+                documents.append(archive.read(info).decode("utf-8"))
+            except UnicodeDecodeError:
+                continue
+    return documents
+
+
+def _windows(lengths: np.ndarray, chunk_size: int, overlap: int) -> List[int]:
+    """Token lengths of greedy chunks over consecutive pieces."""
+    cumulative = np.concatenate(([0], np.cumsum(lengths)))
+    count = len(lengths)
+    chunks: List[int] = []
+    start = 0
+    while start < count:
+        end = int(
+            np.searchsorted(cumulative, cumulative[start] + chunk_size, side="right")
+        )
+        end = max(end - 1, start + 1)
+        chunks.append(int(cumulative[end] - cumulative[start]))
+        if end >= count:
+            break
+        back = int(np.searchsorted(cumulative, cumulative[end] - overlap, side="left"))
+        start = max(back, start + 1)
+    return chunks
+
+
+def _pieces(text: str, separator: str) -> List[str]:
+    if not separator:
+        return list(text)
+    parts = text.split(separator)
+    pieces = [part + separator for part in parts[:-1]] + parts[-1:]
+    return [piece for piece in pieces if piece]
+
+
+def split_lengths(
+    text: str,
+    chunk_size: int,
+    overlap: int,
+    separators: Sequence[str],
+    count_tokens: TokenCounter,
+) -> List[int]:
+    """Token lengths of the chunks a recursive splitter produces for ``text``."""
+    separator, rest = separators[0], separators[1:]
+    pieces = _pieces(text, separator)
+    if not pieces:
+        return []
+    lengths = count_tokens(pieces)
+    chunks: List[int] = []
+    oversized = np.flatnonzero(lengths > chunk_size) if rest else np.array([], int)
+    start = 0
+    for index in itertools.chain(oversized.tolist(), [len(pieces)]):
+        if index > start:
+            chunks.extend(_windows(lengths[start:index], chunk_size, overlap))
+        if index < len(pieces):
+            chunks.extend(
+                split_lengths(pieces[index], chunk_size, overlap, rest, count_tokens)
+            )
+        start = index + 1
+    return chunks
+
+
+DEFAULT_CHUNKING_METHOD = "recursive"
+# Local simulations of the server-side chunking methods, by method name.
+_SPLITTERS: Dict[str, Callable[..., List[int]]] = {"recursive": split_lengths}
+
+
+@dataclass
+class ChunkingEstimate:
+    chunk_size: int
+    chunk_overlap_percentage: int
+    embedding_model: str
+    documents: int
+    chunks: int
+    total_tokens: int
+    mean_tokens: float
+    p50_tokens: float
+    p95_tokens: float
+    max_tokens: int
+    embedding_seconds: float
+    embedding_cost: Optional[float] = None
+
+
+def estimate_chunking(
+    documents: List[str],
+    parameters: ChunkingParameters,
+    count_tokens: Optional[TokenCounter] = None,
+    tokens_per_second: Optional[float] = None,
+    cost_per_million_tokens: Optional[float] = None,
+) -> ChunkingEstimate:
+    """Chunk ``documents`` locally as a vector database with ``parameters`` would.
+
+    Raises ``ValueError`` for chunking methods other than ``recursive``,
+    whose chunks cannot be simulated locally.
+    """
+    method = (
+        getattr(parameters.chunking_method, "value", parameters.chunking_method)
+        or DEFAULT_CHUNKING_METHOD
+    )
+    if method not in _SPLITTERS:
+        raise ValueError(f"Cannot estimate the {method!r} chunking method")
+    splitter = _SPLITTERS[method]
+    count_tokens = count_tokens or token_counter()
+    chunk_size = parameters.chunk_size or 256
+    overlap_percentage = parameters.chunk_overlap_percentage or 0
+    overlap = chunk_size * overlap_percentage // 100
+    separators = parameters.separators or DEFAULT_SEPARATORS
+    if separators[-1] != "":
+        separators = [*separators, ""]
+    embedding_model = (
+        getattr(parameters.embedding_model, "value", parameters.embedding_model)
+        or DEFAULT_EMBEDDING_MODEL
+    )
+
+    lengths = np.fromiter(
+        itertools.chain.from_iterable(
+            splitter(document, chunk_size, overlap, separators, count_tokens)
+            for document in documents
+        ),
+        dtype=np.int64,
+    )
+    total = int(lengths.sum())
+    rate = tokens_per_second or EMBEDDING_TOKENS_PER_SECOND.get(embedding_model)
+    return ChunkingEstimate(
+        chunk_size=chunk_size,
+        chunk_overlap_percentage=overlap_percentage,
+        embedding_model=embedding_model,
+        documents=len(documents),
+        chunks=len(lengths),
+        total_tokens=total,
+        mean_tokens=float(lengths.mean()) if len(lengths) else 0.0,
+        p50_tokens=float(np.percentile(lengths, 50)) if len(lengths) else 0.0,
+        p95_tokens=float(np.percentile(lengths, 95)) if len(lengths) else 0.0,
+        max_tokens=int(lengths.max()) if len(lengths) else 0,
+        embedding_seconds=total / rate if rate else float("nan"),
+        embedding_cost=(
+            total / 1e6 * cost_per_million_tokens
+            if cost_per_million_tokens is not None
+            else None
+        ),
+    )
+
+
+def estimate_file(
+    file_path: str,
+    parameters: Iterable[ChunkingParameters],
+    tokens_per_second: Optional[float] = None,
+    cost_per_million_tokens: Optional[float] = None,
+) -> List[ChunkingEstimate]:
+    """Estimate every chunking setting for the corpus at ``file_path``."""
+    documents = load_documents(file_path)
+    count_tokens = token_counter()
+    return [
+        estimate_chunking(
+            documents,
+            chunking_parameters,
+            count_tokens,
+            tokens_per_second,
+            cost_per_million_tokens,
+        )
+        for chunking_parameters in parameters
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "file_path", help="corpus file or directory, as in DatasetArgs.file_path"
+    )
+    parser.add_argument("--chunk-size", nargs="+", type=int, default=[256])
+    parser.add_argument("--overlap", nargs="+", type=int, default=[0])
+    parser.add_argument("--embedding-model", default=DEFAULT_EMBEDDING_MODEL)
+    parser.add_argument("--separators", nargs="+")
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--cost-per-million-tokens", type=float)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    parameters = [
+        ChunkingParameters(
+            embedding_model=args.embedding_model,
+            chunk_size=chunk_size,
+            chunk_overlap_percentage=overlap,
+            separators=args.separators,
+        )
+        for chunk_size, overlap in itertools.product(args.chunk_size, args.overlap)
+    ]
+    results = estimate_file(
+        args.file_path,
+        parameters,
+        args.tokens_per_second,
+        args.cost_per_million_tokens,
+    )
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))
+    else:
+        for result in results:
+            cost = (
+                f", ${result.embedding_cost:.2f}"
+                if result.embedding_cost is not None
+                else ""
+            )
+            print(
+                f"size {result.chunk_size:>3} overlap {result.chunk_overlap_percentage:>2}%: "
+                f"{result.chunks} chunks, {result.total_tokens} tokens "
+                f"(p50 {result.p50_tokens:.0f}, p95 {result.p95_tokens:.0f}, "
+                f"max {result.max_tokens}), "
+                f"~{result.embedding_seconds / 60:.1f} min embedding{cost}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,29 @@
+import asyncio
+import os
 import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pulumi
 import yaml
 
 import datarobot as dr
-from typing import Dict, Tuple, List, Iterable
+from typing import Any, Dict, Tuple, List, Iterable, NamedTuple, Optional
 
+from . import cache
 
-def get_statuses(flags: Iterable[str]) -> Dict[str, bool]:
-    client = dr.client.get_client()
+FEATURE_FLAG_CACHE_TTL_ENV = "DATAROBOT_FEATURE_FLAG_CACHE_TTL"
+DEFAULT_FEATURE_FLAG_CACHE_TTL = 600.0
+INVALID_FLAG_TTL_ENV = "DATAROBOT_INVALID_FEATURE_FLAG_TTL"
+# Long enough to skip the 422 round trip, short enough to notice a rollout.
+DEFAULT_INVALID_FLAG_TTL = 7 * 24 * 3600.0
+_CACHE_NAMESPACE = "feature_flags"
+
+
+def get_statuses(
+    flags: Iterable[str], client: Optional[dr.rest.RESTClientObject] = None
+) -> Dict[str, bool]:
+    client = client or dr.client.get_client()
     flags_json = {"entitlements": [{"name": flag} for flag in flags]}
     response = client.post("entitlements/evaluate/", json=flags_json)
     return {
@@ -25,36 +40,170 @@ def get_corrections(
     ]
 
 
-def eval_feature_flags(
-    desired: Dict[str, bool],
-) -> Tuple[List[Tuple[str, bool]], List[str]]:
-    invalid: List[str] = []
+def _invalid_flags_path(client: dr.rest.RESTClientObject) -> pathlib.Path:
+    key = cache.cache_key(client.endpoint)
+    return cache.cache_dir(_CACHE_NAMESPACE, "invalid") / f"{key}.json"
+
+
+def get_invalid_flag_ttl(invalid_ttl: Optional[float] = None) -> float:
+    """Resolve how long, in seconds, a rejected flag is skipped.
+
+    An explicit value wins, then ``DATAROBOT_INVALID_FEATURE_FLAG_TTL``, then
+    the default of a week. A TTL of 0 always sends every flag.
+    """
+    if invalid_ttl is not None:
+        return invalid_ttl
+    return float(os.environ.get(INVALID_FLAG_TTL_ENV, DEFAULT_INVALID_FLAG_TTL))
+
+
+def _read_invalid_flags(client: dr.rest.RESTClientObject) -> Dict[str, float]:
+    recorded = cache.read_json(_invalid_flags_path(client))
+    # Entries map each flag to when it was last rejected.
+    return recorded if isinstance(recorded, dict) else {}
+
+
+def get_known_invalid_flags(
+    client: Optional[dr.rest.RESTClientObject] = None,
+    invalid_ttl: Optional[float] = None,
+) -> List[str]:
+    """Flags the client's endpoint rejected within the last ``invalid_ttl`` seconds."""
+    client = client or dr.client.get_client()
+    ttl = get_invalid_flag_ttl(invalid_ttl)
+    now = time.time()
+    return sorted(
+        flag
+        for flag, recorded_at in _read_invalid_flags(client).items()
+        if now - recorded_at <= ttl
+    )
+
+
+def record_invalid_flags(
+    flags: Iterable[str], client: Optional[dr.rest.RESTClientObject] = None
+) -> None:
+    """Remember flags the client's endpoint rejected so they are skipped for a while."""
+    client = client or dr.client.get_client()
+    flags = list(flags)
+    if not flags:
+        return
+    ttl = get_invalid_flag_ttl()
+    now = time.time()
+    recorded = {
+        flag: recorded_at
+        for flag, recorded_at in _read_invalid_flags(client).items()
+        if now - recorded_at <= ttl
+    }
+    recorded.update(dict.fromkeys(flags, now))
+    cache.write_json(_invalid_flags_path(client), recorded)
+
+
+def _fetch_feature_flags(
+    flags: Iterable[str], client: dr.rest.RESTClientObject
+) -> Tuple[Dict[str, bool], List[str]]:
+    known_invalid = set(get_known_invalid_flags(client))
+    invalid: List[str] = [flag for flag in flags if flag in known_invalid]
+    flags = [flag for flag in flags if flag not in known_invalid]
     try:
-        status = get_statuses(desired.keys())
-        return get_corrections(desired, status), invalid
+        return get_statuses(flags, client), invalid
     except dr.errors.ClientError as e:
         if e.status_code == 422:
-            for _, value in e.json["errors"].items():
-                invalid.append(value)
-            desired = {k: v for k, v in desired.items() if k not in invalid}
-            status = get_statuses(desired.keys())
-            return get_corrections(desired, status), invalid
+            rejected = list(e.json["errors"].values())
+            record_invalid_flags(rejected, client)
+            invalid.extend(rejected)
+            flags = [flag for flag in flags if flag not in invalid]
+            return get_statuses(flags, client), invalid
         else:
             raise e
 
 
-def check_feature_flags(
-    yaml_path: pathlib.Path, raise_corrections: bool = True
-) -> None:
-    """Find incorrect, and invalid feature flags
+def get_cache_ttl(cache_ttl: Optional[float] = None) -> float:
+    """Resolve the feature flag cache TTL in seconds.
 
-    Returns a list of feature flag corrections the user needs to make and
-    a list of invalid feature flags.
+    An explicit value wins, then ``DATAROBOT_FEATURE_FLAG_CACHE_TTL``, then
+    the default. A TTL of 0 disables the cache.
     """
+    if cache_ttl is not None:
+        return cache_ttl
+    return float(
+        os.environ.get(FEATURE_FLAG_CACHE_TTL_ENV, DEFAULT_FEATURE_FLAG_CACHE_TTL)
+    )
+
+
+def _cache_path(flags: Iterable[str], client: dr.rest.RESTClientObject) -> pathlib.Path:
+    # The token only identifies the account; it is hashed into the key and never stored.
+    key = cache.cache_key(client.endpoint, client.token, sorted(flags))
+    return cache.cache_dir(_CACHE_NAMESPACE) / f"{key}.json"
+
+
+def clear_feature_flag_cache() -> None:
+    """Drop every cached feature flag evaluation and the invalid flag registry."""
+    cache.clear(_CACHE_NAMESPACE)
+
+
+def _cached_statuses(
+    flags: List[str], ttl: float, client: dr.rest.RESTClientObject
+) -> Optional[Tuple[Dict[str, bool], List[str]]]:
+    if ttl <= 0:
+        return None
+    cached = cache.read_json(_cache_path(flags, client), ttl=ttl)
+    return (cached["status"], cached["invalid"]) if cached is not None else None
+
+
+def _evaluate(
+    flags: List[str], ttl: float, client: dr.rest.RESTClientObject
+) -> Tuple[Dict[str, bool], List[str]]:
+    status, invalid = _fetch_feature_flags(flags, client)
+    if ttl > 0:
+        cache.write_json(
+            _cache_path(flags, client), {"status": status, "invalid": invalid}
+        )
+    return status, invalid
+
+
+def eval_feature_flag_statuses(
+    flags: Iterable[str],
+    cache_ttl: Optional[float] = None,
+    client: Optional[dr.rest.RESTClientObject] = None,
+) -> Tuple[Dict[str, bool], List[str]]:
+    """Current values of the valid flags, and the names of invalid ones."""
+    client = client or dr.client.get_client()
+    flags = sorted(set(flags))
+    ttl = get_cache_ttl(cache_ttl)
+    return _cached_statuses(flags, ttl, client) or _evaluate(flags, ttl, client)
+
+
+def eval_feature_flags(
+    desired: Dict[str, bool],
+    cache_ttl: Optional[float] = None,
+    client: Optional[dr.rest.RESTClientObject] = None,
+) -> Tuple[List[Tuple[str, bool]], List[str]]:
+    """Corrections needed to reach ``desired``, and the names of invalid flags.
+
+    Only a cached evaluation that needs no corrections is trusted; otherwise
+    the flags are evaluated again, so a flag the user fixed after a failed
+    run is not reported from the cache.
+    """
+    client = client or dr.client.get_client()
+    flags = sorted(set(desired))
+    ttl = get_cache_ttl(cache_ttl)
+    cached = _cached_statuses(flags, ttl, client)
+    if cached is not None and not get_corrections(desired, cached[0]):
+        return [], cached[1]
+    status, invalid = _evaluate(flags, ttl, client)
+    return get_corrections(desired, status), invalid
+
+
+def load_feature_flags(yaml_path: pathlib.Path) -> Dict[str, bool]:
     with open(yaml_path) as f:
         desired = yaml.safe_load(f)
-        desired = {k: bool(v) for k, v in desired.items()}
-    corrections, invalid = eval_feature_flags(desired)
+        return {k: bool(v) for k, v in desired.items()}
+
+
+def _report_feature_flags(
+    desired: Dict[str, bool],
+    corrections: List[Tuple[str, bool]],
+    invalid: List[str],
+    raise_corrections: bool,
+) -> None:
     for flag in invalid:
         correct_value = desired[flag]
         pulumi.warn(
@@ -64,3 +213,101 @@ def check_feature_flags(
         pulumi.error(f"Required feature flag '{flag}' must be set to {correct_value}.")
     if len(corrections) and raise_corrections:
         raise pulumi.RunError("Please correct feature flag settings.")
+
+
+def check_feature_flags(
+    yaml_path: pathlib.Path,
+    raise_corrections: bool = True,
+    cache_ttl: Optional[float] = None,
+) -> None:
+    """Find incorrect, and invalid feature flags
+
+    Returns a list of feature flag corrections the user needs to make and
+    a list of invalid feature flags.
+
+    Evaluations are cached on disk per endpoint, account and flag set for
+    ``cache_ttl`` seconds (see ``get_cache_ttl``); a cached evaluation that
+    needs corrections is re-checked before anything is reported. Call
+    ``clear_feature_flag_cache`` to force a refresh.
+    """
+    desired = load_feature_flags(yaml_path)
+    corrections, invalid = eval_feature_flags(desired, cache_ttl=cache_ttl)
+    _report_feature_flags(desired, corrections, invalid, raise_corrections)
+
+
+def check_feature_flags_async(
+    yaml_path: pathlib.Path,
+    raise_corrections: bool = True,
+    cache_ttl: Optional[float] = None,
+) -> pulumi.Output[List[Tuple[str, bool]]]:
+    """Non-blocking variant of ``check_feature_flags``.
+
+    The entitlement request runs in a worker thread while the program keeps
+    declaring resources. The returned Output resolves to the list of
+    corrections; if ``raise_corrections`` is set and corrections are needed
+    it fails with ``pulumi.RunError``, which fails the deployment when the
+    program finishes. Feed the Output into a resource input (or ``apply``)
+    to hold back specific resources until the check has passed.
+    """
+
+    async def _check() -> List[Tuple[str, bool]]:
+        desired = load_feature_flags(yaml_path)
+        corrections, invalid = await asyncio.to_thread(
+            eval_feature_flags, desired, cache_ttl
+        )
+        _report_feature_flags(desired, corrections, invalid, raise_corrections)
+        return corrections
+
+    return pulumi.Output.from_input(_check())
+
+
+class FeatureFlagReport(NamedTuple):
+    endpoint: str
+    yaml_path: pathlib.Path
+    corrections: List[Tuple[str, bool]]
+    invalid: List[str]
+
+
+def check_feature_flags_batch(
+    yaml_paths: Iterable[pathlib.Path],
+    clients: Optional[Iterable[dr.rest.RESTClientObject]] = None,
+    cache_ttl: Optional[float] = None,
+    max_workers: Optional[int] = None,
+) -> List[FeatureFlagReport]:
+    """Audit many feature flag files against many DataRobot endpoints.
+
+    The union of flag names across all files is evaluated once per endpoint,
+    with endpoints queried concurrently, and corrections are reported per
+    (endpoint, file) pair. ``clients`` defaults to the configured client.
+    Nothing is logged or raised; callers decide what to do with the reports.
+    """
+    desired_by_path = {
+        pathlib.Path(path): load_feature_flags(path) for path in yaml_paths
+    }
+    flags = {flag for desired in desired_by_path.values() for flag in desired}
+    clients = list(clients) if clients is not None else [dr.client.get_client()]
+    if not clients:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(clients)) as executor:
+        evaluations = list(
+            executor.map(
+                lambda client: eval_feature_flag_statuses(flags, cache_ttl, client),
+                clients,
+            )
+        )
+
+    reports = []
+    for client, (status, invalid) in zip(clients, evaluations):
+        for path, desired in desired_by_path.items():
+            reports.append(
+                FeatureFlagReport(
+                    endpoint=client.endpoint,
+                    yaml_path=path,
+                    corrections=get_corrections(
+                        desired, {k: v for k, v in status.items() if k in desired}
+                    ),
+                    invalid=[flag for flag in invalid if flag in desired],
+                )
+            )
+    return reports
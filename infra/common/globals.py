@@ -6,8 +6,11 @@
 # Released under the terms of DataRobot Tool and Utility Agreement.
 
 from enum import Enum
-from typing import Any, List, Union
-from pydantic import BaseModel, field_validator
+from typing import TYPE_CHECKING, Any, List, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+if TYPE_CHECKING:
+    from .runtime_catalog import RuntimeEnvironmentCatalog
 
 
 class RuntimeEnvironment(BaseModel):
@@ -87,6 +90,14 @@ class EnvironmentConfig(BaseModel):
         else:
             return self.environment.id
 
+    def resolve(self, catalog: "RuntimeEnvironmentCatalog") -> RuntimeEnvironment:
+        """Check this environment against a catalog snapshot without calling the API.
+
+        Stale ids are re-resolved by name; raises ``KeyError`` if the
+        environment is unknown to the catalog.
+        """
+        return catalog.resolve(self.id, self.name)
+
 
 class GlobalRuntimeEnvironments(BaseModel):
     environments: List[EnvironmentConfig]
@@ -147,3 +158,57 @@ class GlobalPredictionEnvironmentPlatforms(str, Enum):
     OTHER = "other"
     SNOWFLAKE = "snowflake"
     SAP_AI_CORE = "sapAiCore"
+
+
+class DeploymentProfile(BaseModel):
+    """Prediction serving and monitoring settings for a class of deployment."""
+
+    real_time: bool
+    min_computes: int = Field(ge=0)
+    max_computes: int = Field(ge=1)
+    data_collection: bool
+    feature_drift: bool
+    target_drift: bool
+    challengers: bool = False
+    segment_analysis: bool = False
+
+    @model_validator(mode="after")
+    def validate_computes(self) -> "DeploymentProfile":
+        if self.min_computes > self.max_computes:
+            raise ValueError(
+                f"min_computes ({self.min_computes}) exceeds "
+                f"max_computes ({self.max_computes})"
+            )
+        if self.challengers and not self.data_collection:
+            raise ValueError("Challenger models replay collected prediction data")
+        return self
+
+
+class GlobalDeploymentProfile(Enum):
+    # Kept warm, scales out; no per-request data collection or feature drift.
+    LOW_LATENCY_REALTIME = DeploymentProfile(
+        real_time=True,
+        min_computes=1,
+        max_computes=4,
+        data_collection=False,
+        feature_drift=False,
+        target_drift=True,
+    )
+    # Scales to zero between jobs and wide during them; drift is tracked on
+    # the aggregated batch statistics, raw rows are not stored.
+    HIGH_THROUGHPUT_BATCH = DeploymentProfile(
+        real_time=False,
+        min_computes=0,
+        max_computes=8,
+        data_collection=False,
+        feature_drift=True,
+        target_drift=True,
+    )
+    COST_MINIMAL = DeploymentProfile(
+        real_time=False,
+        min_computes=0,
+        max_computes=1,
+        data_collection=False,
+        feature_drift=False,
+        target_drift=False,
+    )
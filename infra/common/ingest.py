@@ -0,0 +1,262 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Resumable, parallel ingest of large RAG corpora as DataRobot datasets.
+
+A document directory is streamed file by file into a deterministic,
+deflate-compressed zip archive (an existing archive is used as is). The
+archive is uploaded to a data stage in numbered parts of bounded size, in
+parallel, each read straight from disk (memory use is bounded by workers
+times part size); the data stage is then turned into a dataset and the
+built archive is deleted. Progress is recorded per part, so an interrupted
+ingest of the same content resumes with the parts that are missing (or
+starts over if its data stage has expired)::
+
+    python -m infra.common.ingest docs/ --use-case-id 65f... --workers 8
+
+Pass the returned dataset id to ``RAGCustomModel`` as ``dataset_id``.
+"""
+
+import argparse
+import contextlib
+import logging
+import math
+import os
+import pathlib
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+import datarobot as dr
+import requests
+from datarobot.models.dataset import DataStage
+from requests_toolbelt import MultipartEncoder
+
+from . import cache
+from .manifest import ContentManifest, corpus_digest
+
+logger = logging.getLogger(__name__)
+
+_CACHE_NAMESPACE = "ingest"
+DEFAULT_MAX_PART_BYTES = 100 * 1024**2
+# Fixed member timestamp so identical content always builds identical bytes.
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass
+class IngestResult:
+    dataset_id: str
+    # None when the content had already been ingested.
+    archive_path: Optional[str]
+    parts: int
+    parts_uploaded: int = 0
+    bytes_sent: int = 0
+    seconds: float = 0.0
+
+
+def build_archive(source: str) -> pathlib.Path:
+    """Return a zip archive of ``source``, building one for directories.
+
+    Archives are cached by content hash until ``ingest_dataset`` has turned
+    them into a dataset, so rebuilding after an interrupted ingest is
+    skipped and resumed uploads see the same bytes.
+    """
+    if not os.path.isdir(source):
+        return pathlib.Path(source)
+    manifest = ContentManifest(folder_path=source)
+    path = cache.cache_dir(_CACHE_NAMESPACE, "archives") / f"{manifest.digest}.zip"
+    if path.exists():
+        return path
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(
+            f, "w", compression=zipfile.ZIP_DEFLATED
+        ) as archive:
+            for local, remote in manifest.files:
+                info = zipfile.ZipInfo(remote, date_time=_ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(local, "rb") as src, archive.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def _upload_part(
+    client: dr.rest.RESTClientObject,
+    stage_id: str,
+    archive_path: pathlib.Path,
+    part_number: int,
+    max_part_bytes: int,
+    max_retries: int,
+) -> int:
+    offset = (part_number - 1) * max_part_bytes
+    attempt = 0
+    while True:
+        try:
+            with open(archive_path, "rb") as f:
+                f.seek(offset)
+                data = f.read(max_part_bytes)
+            encoder = MultipartEncoder(fields={"file": (f"part{part_number}", data)})
+            client.put(
+                f"{DataStage.url}{stage_id}/parts/{part_number}/",
+                data=encoder,
+                headers={"Content-Type": encoder.content_type},
+            )
+            return len(data)
+        except (dr.errors.ServerError, requests.ConnectionError) as e:
+            if attempt == max_retries:
+                raise
+            delay = min(2**attempt, 30) * (0.5 + random.random())
+            attempt += 1
+            logger.warning(
+                f"Upload of part {part_number} failed ({e}); retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+
+@contextlib.contextmanager
+def _using_client(client: dr.rest.RESTClientObject) -> Iterator[None]:
+    """Route the SDK's model calls (``DataStage``, ``Dataset``) through ``client``."""
+    token = dr.client._context_client.set(client)
+    try:
+        yield
+    finally:
+        dr.client._context_client.reset(token)
+
+
+def _is_not_found(e: Exception) -> bool:
+    return isinstance(e, dr.errors.ClientError) and e.status_code == 404
+
+
+def ingest_dataset(
+    source: str,
+    use_case_id: Optional[str] = None,
+    max_part_bytes: int = DEFAULT_MAX_PART_BYTES,
+    max_workers: int = 4,
+    max_retries: int = 3,
+    client: Optional[dr.rest.RESTClientObject] = None,
+) -> IngestResult:
+    """Upload a corpus directory or archive as a dataset, resuming earlier attempts.
+
+    The dataset is added to ``use_case_id`` when given. Ingesting content
+    that was already ingested returns the existing dataset. Every request
+    goes through ``client``; if its data stage has expired or was deleted,
+    the ingest starts over with a new one.
+    """
+    client = client or dr.client.get_client()
+    digest = corpus_digest(source)
+    state_path = cache.cache_dir(_CACHE_NAMESPACE) / (
+        cache.cache_key(client.endpoint, digest, use_case_id, max_part_bytes) + ".json"
+    )
+    state: Dict[str, Any] = cache.read_json(state_path) or {}
+    if state.get("dataset_id"):
+        return IngestResult(state["dataset_id"], None, len(state["parts"]))
+
+    archive_path = build_archive(source)
+    size = archive_path.stat().st_size
+    parts = max(1, math.ceil(size / max_part_bytes))
+    result = IngestResult(dataset_id="", archive_path=str(archive_path), parts=parts)
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def save(update: Dict[str, Any]) -> None:
+        state.update(update)
+        cache.write_json(state_path, state)
+
+    def upload(part_number: int) -> None:
+        sent = _upload_part(
+            client,
+            state["stage_id"],
+            archive_path,
+            part_number,
+            max_part_bytes,
+            max_retries,
+        )
+        with lock:
+            state["parts"].append(part_number)
+            cache.write_json(state_path, state)
+            result.parts_uploaded += 1
+            result.bytes_sent += sent
+
+    def stage_dataset() -> str:
+        if "stage_id" not in state:
+            stage = DataStage.create_datastage(os.path.basename(archive_path))
+            state.clear()
+            save({"stage_id": stage.id, "parts": []})
+        done = set(state["parts"])
+        missing = [n for n in range(1, parts + 1) if n not in done]
+        if done:
+            logger.info(
+                f"Resuming ingest of {source}: {len(missing)}/{parts} parts left"
+            )
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(upload, missing))
+        stage = DataStage(state["stage_id"])
+        # A run that died after finalizing must not finalize again.
+        if not state.get("finalized"):
+            stage.finalize()
+            save({"finalized": True})
+        return dr.Dataset.create_from_datastage(stage.id, use_cases=use_case_id).id
+
+    with _using_client(client):
+        try:
+            dataset_id = stage_dataset()
+        except Exception as e:
+            if not _is_not_found(e) or "stage_id" not in state:
+                raise
+            logger.warning(
+                f"Data stage {state['stage_id']} is gone ({e}); restarting ingest "
+                f"of {source}"
+            )
+            state.clear()
+            cache.write_json(state_path, state)
+            dataset_id = stage_dataset()
+    result.seconds = time.monotonic() - start
+    result.dataset_id = dataset_id
+    save({"dataset_id": dataset_id})
+    if os.path.isdir(source):
+        # The dataset holds the content now; only the built archive is ours.
+        archive_path.unlink(missing_ok=True)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="document directory or zip archive")
+    parser.add_argument("--use-case-id")
+    parser.add_argument("--part-size-mb", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = ingest_dataset(
+        args.source,
+        use_case_id=args.use_case_id,
+        max_part_bytes=args.part_size_mb * 1024**2,
+        max_workers=args.workers,
+    )
+    mib = result.bytes_sent / 1024**2
+    rate = mib / result.seconds if result.seconds else 0.0
+    print(
+        f"{result.dataset_id}: {result.parts_uploaded}/{result.parts} parts, "
+        f"{mib:.1f} MiB uploaded at {rate:.1f} MiB/s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
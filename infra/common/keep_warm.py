@@ -0,0 +1,234 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Keep serverless deployments warm with scheduled synthetic predictions.
+
+Serverless deployments scale to zero and the first request after that
+pays the cold start. ``KeepWarmScheduler`` pings a set of deployments on a
+jittered interval with a one-row payload built from each deployment's
+feature list, and counts the pings that found the deployment cold (the
+inference server was starting, or the ping was slower than
+``cold_start_seconds``)::
+
+    python -m infra.common.keep_warm 65f... 65e... --interval 240
+
+A Pulumi program only runs during ``pulumi up``, so the scheduler runs as
+its own process or in a background thread (``start``/``stop``). If a
+deployment must never be cold, give it ``min_computes >= 1`` instead (see
+``GlobalDeploymentProfile.LOW_LATENCY_REALTIME``).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import datarobot as dr
+import numpy as np
+import pandas as pd
+
+from .prediction_client import AsyncPredictionClient
+from .readiness import is_starting_error
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 240
+# Payload for deployments without a feature list (e.g. custom models).
+DEFAULT_PAYLOAD = pd.DataFrame({"ping": [0]})
+_PLACEHOLDERS = {
+    "Numeric": 0,
+    "Percentage": 0,
+    "Length": 0,
+    "Currency": 0,
+    "Boolean": False,
+    "Date": "2024-01-01",
+}
+
+
+@dataclass
+class KeepWarmStats:
+    pings: int = 0
+    cold_starts: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def cold_start_rate(self) -> float:
+        return self.cold_starts / self.pings if self.pings else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        latencies = np.array(self.latencies)
+        return {
+            "pings": self.pings,
+            "cold_starts": self.cold_starts,
+            "cold_start_rate": self.cold_start_rate,
+            "errors": self.errors,
+            "p50_seconds": float(np.percentile(latencies, 50)) if len(latencies) else 0,
+            "max_seconds": float(latencies.max()) if len(latencies) else 0,
+        }
+
+
+def synthetic_payload(deployment_id: str) -> pd.DataFrame:
+    """One prediction row with a placeholder value for each deployment feature."""
+    features = dr.Deployment.get(deployment_id).get_features()
+    if not features:
+        return DEFAULT_PAYLOAD
+    return pd.DataFrame(
+        {
+            feature["name"]: [_PLACEHOLDERS.get(feature["feature_type"], "a")]
+            for feature in features
+        }
+    )
+
+
+class KeepWarmScheduler:
+    """Periodically ping deployments so they stay scaled up.
+
+    Parameters:
+    -----------
+    deployment_ids : Iterable[str]
+        Deployments to keep warm.
+    interval : float
+        Seconds between ping rounds; keep it below the scale-to-zero delay.
+    jitter : float
+        Fraction by which each interval is randomly shortened or lengthened.
+    cold_start_seconds : float
+        Pings slower than this count as cold starts.
+    payloads : Optional[Dict[str, pd.DataFrame]]
+        Payloads per deployment; derived from the feature list otherwise.
+    prediction_client : Optional[AsyncPredictionClient]
+        Client used for pings; one is created (and closed) if not given.
+    """
+
+    def __init__(
+        self,
+        deployment_ids: Iterable[str],
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        jitter: float = 0.1,
+        cold_start_seconds: float = 5.0,
+        payloads: Optional[Dict[str, pd.DataFrame]] = None,
+        prediction_client: Optional[AsyncPredictionClient] = None,
+    ):
+        self.deployment_ids = list(deployment_ids)
+        self.interval = interval
+        self.jitter = jitter
+        self.cold_start_seconds = cold_start_seconds
+        self.payloads: Dict[str, pd.DataFrame] = dict(payloads or {})
+        self.stats = {
+            deployment_id: KeepWarmStats() for deployment_id in self.deployment_ids
+        }
+        self._client = prediction_client
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    async def ping(self, client: AsyncPredictionClient, deployment_id: str) -> None:
+        stats = self.stats[deployment_id]
+        stats.pings += 1
+        if deployment_id not in self.payloads:
+            try:
+                self.payloads[deployment_id] = await asyncio.to_thread(
+                    synthetic_payload, deployment_id
+                )
+            except Exception as e:
+                # Nothing is cached, so the payload is derived again next round.
+                stats.errors += 1
+                logger.warning(f"Keep-warm payload for {deployment_id} failed: {e}")
+                return
+        start = time.perf_counter()
+        try:
+            await client.predict(deployment_id, self.payloads[deployment_id])
+        except dr.errors.ServerError as e:
+            if not is_starting_error(e):
+                stats.errors += 1
+                logger.warning(f"Keep-warm ping of {deployment_id} failed: {e}")
+                return
+            # The ping itself triggered the scale-up.
+            stats.cold_starts += 1
+            logger.info(f"{deployment_id} was cold; inference server starting")
+            return
+        except (dr.errors.ClientError, OSError) as e:
+            stats.errors += 1
+            logger.warning(f"Keep-warm ping of {deployment_id} failed: {e}")
+            return
+        latency = time.perf_counter() - start
+        stats.latencies.append(latency)
+        if latency > self.cold_start_seconds:
+            stats.cold_starts += 1
+            logger.info(f"{deployment_id} was cold; ping took {latency:.1f}s")
+
+    async def run(self, rounds: Optional[int] = None) -> None:
+        """Ping every deployment each interval, for ``rounds`` rounds or until stopped."""
+        client = self._client or AsyncPredictionClient(
+            max_concurrency=min(len(self.deployment_ids), 16) or 1
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            completed = 0
+            while not self._stop.is_set():
+                await asyncio.gather(
+                    *(self.ping(client, i) for i in self.deployment_ids)
+                )
+                completed += 1
+                if rounds is not None and completed >= rounds:
+                    break
+                delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+                await loop.run_in_executor(None, self._stop.wait, delay)
+        finally:
+            if self._client is None:
+                client.close()
+
+    def start(self) -> None:
+        """Run the scheduler in a background daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self.run()), name="keep-warm", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            deployment_id: stats.to_dict()
+            for deployment_id, stats in self.stats.items()
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("deployment_ids", nargs="+")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_SECONDS)
+    parser.add_argument("--cold-start-seconds", type=float, default=5.0)
+    parser.add_argument("--rounds", type=int, help="stop after this many rounds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    dr.Client()
+    scheduler = KeepWarmScheduler(
+        args.deployment_ids,
+        interval=args.interval,
+        cold_start_seconds=args.cold_start_seconds,
+    )
+    try:
+        asyncio.run(scheduler.run(args.rounds))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(scheduler.summary(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
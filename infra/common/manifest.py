@@ -0,0 +1,159 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Content-addressed manifests of local resource files.
+
+A manifest records size, stat times and SHA-256 of every file behind a
+``folder_path``/``files`` pair. Hashes are persisted and only recomputed
+for files whose stat changed, so an unchanged folder is recognized from
+stat calls alone. The local cache only saves rehashing; what a stack has
+deployed is read from the stack's own state (see ``stack_state``).
+"""
+
+import hashlib
+import os
+import pathlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import pulumi
+
+from . import cache, stack_state
+
+_CACHE_NAMESPACE = "manifests"
+_CHUNK_SIZE = 1024 * 1024
+
+
+def list_files(
+    folder_path: Optional[str] = None, files: Optional[List[Tuple[str, str]]] = None
+) -> List[Tuple[str, str]]:
+    """Flatten ``folder_path`` and ``files`` into sorted (local_path, remote_path) pairs."""
+    pairs: List[Tuple[str, str]] = []
+    if folder_path:
+        root = pathlib.Path(folder_path)
+        for path in root.rglob("*"):
+            if path.is_file():
+                pairs.append((str(path), path.relative_to(root).as_posix()))
+    if files:
+        pairs.extend((str(local), str(remote)) for local, remote in files)
+    return sorted(pairs, key=lambda pair: pair[1])
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_key(stat: os.stat_result) -> List[int]:
+    # ctime is included because it changes on every write, even when the
+    # mtime is pinned with os.utime.
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino]
+
+
+class ContentManifest:
+    """Per-file stat and hash records for one set of files."""
+
+    def __init__(
+        self,
+        folder_path: Optional[str] = None,
+        files: Optional[List[Tuple[str, str]]] = None,
+    ):
+        self.mode = "folder_path" if folder_path else "files"
+        self.files = list_files(folder_path, files)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hashed = 0
+        self._path = cache.cache_dir(_CACHE_NAMESPACE) / (
+            cache.cache_key(self.mode, [local for local, _ in self.files]) + ".json"
+        )
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Stat every file, rehashing only those whose stat changed."""
+        previous: Dict[str, Dict[str, Any]] = cache.read_json(self._path) or {}
+        entries = {}
+        self.hashed = 0
+        for local, remote in self.files:
+            key = _stat_key(os.stat(local))
+            record = previous.get(local)
+            if record is None or record["stat"] != key:
+                record = {"stat": key, "sha256": hash_file(local)}
+                self.hashed += 1
+            entries[local] = {**record, "remote": remote}
+        self.entries = entries
+        if entries != previous:
+            cache.write_json(self._path, entries)
+
+    @property
+    def digest(self) -> str:
+        """Hash of the remote layout and content, independent of stat times."""
+        return cache.cache_key(
+            self.mode,
+            [(entry["remote"], entry["sha256"]) for entry in self.entries.values()],
+        )
+
+
+# Remote name of a single-file corpus, so its digest does not depend on the
+# file's name or location.
+CORPUS_FILE_NAME = "dataset"
+
+
+def corpus_manifest(source: str) -> ContentManifest:
+    """Manifest of a RAG corpus: a document directory, or a single file or archive."""
+    if os.path.isdir(source):
+        return ContentManifest(folder_path=source)
+    return ContentManifest(files=[(source, CORPUS_FILE_NAME)])
+
+
+def corpus_digest(source: str) -> str:
+    """Content hash identifying a RAG corpus, e.g. for ``DatasetRegistry.add_existing``.
+
+    Uploaded (``file_path``) and pre-ingested (``dataset_id``) corpora with
+    the same content get the same digest, and renaming or moving a file
+    keeps it.
+    """
+    return corpus_manifest(source).digest
+
+
+class ContentTracker:
+    """Skip re-diffing resource files that are unchanged since the last deploy.
+
+    The digest deployed by each resource is recorded in the stack's state
+    output under the resource's type and name (see ``stack_state``), so it
+    is the same on every machine deploying the stack and does not collide
+    with other resources or with the program's own outputs. When the current manifest matches it, ``ignore_changes`` lists
+    the file ``properties`` (by default the custom model ones) so the
+    provider does not repackage, diff or replace on them; creation of a
+    missing resource still uses the real inputs. ``record`` records the
+    digest once the resource has been created or updated successfully.
+    """
+
+    FILE_PROPERTIES = ["folderPath", "files"]
+
+    def __init__(
+        self,
+        resource_type: str,
+        resource_name: str,
+        folder_path: Optional[str] = None,
+        files: Optional[List[Tuple[str, str]]] = None,
+        properties: Optional[List[str]] = None,
+        manifest: Optional[ContentManifest] = None,
+    ):
+        self.properties = properties or self.FILE_PROPERTIES
+        self.manifest = manifest or ContentManifest(folder_path, files)
+        self._key = f"{resource_type}::{resource_name}:contentDigest"
+        self.unchanged = stack_state.previous(self._key) == self.manifest.digest
+
+    @property
+    def ignore_changes(self) -> List[str]:
+        return self.properties if self.unchanged else []
+
+    def record(self, output: pulumi.Output[Any]) -> None:
+        # Re-recorded on every run; outputs missing from a run are dropped.
+        digest = self.manifest.digest
+        stack_state.record(self._key, output.apply(lambda _: digest))
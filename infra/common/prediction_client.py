@@ -0,0 +1,213 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Concurrent prediction client for driving load at deployments.
+
+``AsyncPredictionClient`` sends realtime prediction requests from asyncio
+code over one keep-alive connection pool, with at most
+``max_concurrency`` requests in flight. Each deployment's prediction URL
+and headers are resolved once (one ``Deployment.get`` per deployment, not
+per request) and every request's latency is recorded::
+
+    async with AsyncPredictionClient(max_concurrency=32) as client:
+        await asyncio.gather(*(client.predict(deployment_id, df) for _ in range(1000)))
+        print(client.latency_summary())
+
+Requests are made with ``requests`` on a dedicated thread pool, so no
+async HTTP library is needed.
+"""
+
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+import datarobot as dr
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# Realtime prediction requests are limited to 50 MB.
+REQUEST_LIMIT_BYTES = 50 * 1024**2
+
+
+class DeploymentEndpoint(NamedTuple):
+    url: str
+    headers: Dict[str, str]
+
+
+class PredictionResponse(NamedTuple):
+    dataframe: Optional[pd.DataFrame]
+    content: bytes
+    status_code: int
+    latency_seconds: float
+
+
+def resolve_endpoint(
+    deployment: dr.Deployment, client: Optional[dr.rest.RESTClientObject] = None
+) -> DeploymentEndpoint:
+    """Prediction URL and headers of a deployment, as ``datarobot_predict`` resolves them."""
+    client = client or dr.client.get_client()
+    headers = {"Authorization": f"Bearer {client.token}"}
+    server = deployment.default_prediction_server
+    if server:
+        if server.get("datarobot-key"):
+            headers["datarobot-key"] = server["datarobot-key"]
+        url = f"{server['url']}/predApi/v1.0/deployments/{deployment.id}/predictions"
+    elif (deployment.prediction_environment or {}).get(
+        "platform"
+    ) == "datarobotServerless":
+        url = f"{client.endpoint}/deployments/{deployment.id}/predictions"
+    else:
+        raise ValueError(f"Deployment {deployment.id} has no prediction server")
+    return DeploymentEndpoint(url, headers)
+
+
+class AsyncPredictionClient:
+    """Pooled, concurrency-limited realtime prediction client for asyncio.
+
+    Parameters:
+    -----------
+    max_concurrency : int
+        Maximum number of requests in flight; also the connection pool size.
+    timeout : float
+        Per-request timeout in seconds.
+    client : Optional[dr.rest.RESTClientObject]
+        DataRobot client used to resolve deployments; the global client by
+        default.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        timeout: float = 600,
+        client: Optional[dr.rest.RESTClientObject] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._client = client
+        self._endpoints: Dict[str, DeploymentEndpoint] = {}
+        self._endpoints_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrency, pool_maxsize=max_concurrency
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncPredictionClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+    def endpoint(self, deployment_id: str) -> DeploymentEndpoint:
+        """Return the cached prediction endpoint of a deployment, resolving it once."""
+        with self._endpoints_lock:
+            if deployment_id not in self._endpoints:
+                client = self._client or dr.client.get_client()
+                self._endpoints[deployment_id] = resolve_endpoint(
+                    dr.Deployment.get(deployment_id), client
+                )
+            return self._endpoints[deployment_id]
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            # Semaphores are bound to a loop; tests often run several loops.
+            self._semaphores = {loop: asyncio.Semaphore(self.max_concurrency)}
+        return self._semaphores[loop]
+
+    def _post(
+        self, deployment_id: str, body: bytes, content_type: str
+    ) -> PredictionResponse:
+        endpoint = self.endpoint(deployment_id)
+        headers = {
+            **endpoint.headers,
+            "Content-Type": content_type,
+            "Accept": "text/csv",
+        }
+        start = time.perf_counter()
+        try:
+            response = self._session.post(
+                endpoint.url, data=body, headers=headers, timeout=self.timeout
+            )
+        except requests.RequestException:
+            # Timeouts and dropped connections are the failures of an overload.
+            with self._stats_lock:
+                self.errors += 1
+            raise
+        latency = time.perf_counter() - start
+        if response.status_code >= 400:
+            with self._stats_lock:
+                self.errors += 1
+            error_type = (
+                dr.errors.ServerError
+                if response.status_code >= 500
+                else dr.errors.ClientError
+            )
+            raise error_type(
+                f"{response.status_code} predicting with {deployment_id}: "
+                f"{response.text}",
+                response.status_code,
+            )
+        with self._stats_lock:
+            self.latencies.append(latency)
+        dataframe = None
+        if response.headers.get("Content-Type", "").startswith("text/csv"):
+            dataframe = pd.read_csv(io.BytesIO(response.content))
+        return PredictionResponse(
+            dataframe, response.content, response.status_code, latency
+        )
+
+    async def predict(
+        self,
+        deployment_id: str,
+        data: Union[pd.DataFrame, bytes, str],
+        content_type: str = "text/csv",
+    ) -> PredictionResponse:
+        """Score ``data`` (a DataFrame or CSV/JSON body) against a deployment."""
+        if isinstance(data, pd.DataFrame):
+            data = data.to_csv(index=False)
+        body = data.encode() if isinstance(data, str) else data
+        if len(body) > REQUEST_LIMIT_BYTES:
+            raise ValueError(
+                f"Request of {len(body)} bytes exceeds the 50 MB prediction limit"
+            )
+        async with self._semaphore():
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._post, deployment_id, body, content_type
+            )
+
+    def latency_summary(self) -> Dict[str, float]:
+        """Successful request count, error count and latency percentiles in seconds.
+
+        Errors include HTTP error responses, timeouts and connection errors.
+        """
+        latencies = np.array(self.latencies)
+        summary: Dict[str, float] = {
+            "requests": len(latencies),
+            "errors": self.errors,
+        }
+        if len(latencies):
+            for name, q in (("p50", 50), ("p95", 95), ("p99", 99)):
+                summary[name] = float(np.percentile(latencies, q))
+            summary["mean"] = float(latencies.mean())
+            summary["max"] = float(latencies.max())
+        return summary
@@ -0,0 +1,152 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Plan-time validation of schema args before any resource is registered.
+
+Collect the args a program is about to use and check them in one local
+pass, so a stale environment id, an LLM the account cannot use or a bad
+enum value in raw provider args fails the program immediately with every
+problem listed, instead of surfacing one provider error at a time minutes
+into ``pulumi up``. Enum fields of the schema args are already validated
+by pydantic when the args are built::
+
+    preflight = PreflightValidator(RuntimeEnvironmentCatalog.load_or_sync())
+    preflight.add(custom_model_args, llm_blueprint_args, prediction_environment_args)
+    preflight.check()
+"""
+
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import pulumi
+import pulumi_datarobot as datarobot
+from pydantic import BaseModel
+
+from .globals import (
+    GlobalGuardrailTemplateName,
+    GlobalLLM,
+    GlobalPredictionEnvironmentPlatforms,
+)
+from .runtime_catalog import RuntimeEnvironmentCatalog
+from .schema import CustomModelArgs, LLMBlueprintArgs
+
+# Schema args validate these fields as enums when they are built; raw
+# provider args take plain strings, so those are checked here.
+_RAW_ENUM_FIELDS: Dict[type, Tuple[str, Type[Enum]]] = {
+    datarobot.LlmBlueprintArgs: ("llm_id", GlobalLLM),
+    datarobot.CustomModelGuardConfigurationArgs: (
+        "template_name",
+        GlobalGuardrailTemplateName,
+    ),
+    datarobot.PredictionEnvironmentArgs: (
+        "platform",
+        GlobalPredictionEnvironmentPlatforms,
+    ),
+}
+
+
+def _enum_error(value: str, enum: Type[Enum]) -> Optional[str]:
+    if value in enum._value2member_map_:
+        return None
+    return f"{value!r} is not a valid {enum.__name__}"
+
+
+class PreflightValidator:
+    """Batch validator for the schema args of a Pulumi program.
+
+    Parameters:
+    -----------
+    catalog : Optional[RuntimeEnvironmentCatalog]
+        Snapshot used to check environment ids; environment checks are
+        skipped without one.
+    available_llms : Optional[Iterable[str]]
+        LLM ids enabled for the account, if narrower than ``GlobalLLM``.
+    """
+
+    def __init__(
+        self,
+        catalog: Optional[RuntimeEnvironmentCatalog] = None,
+        available_llms: Optional[Iterable[str]] = None,
+    ):
+        self.catalog = catalog
+        self.available_llms = set(available_llms) if available_llms else None
+        self.args: List[Any] = []
+
+    def add(self, *args: Any) -> "PreflightValidator":
+        self.args.extend(args)
+        return self
+
+    def errors(self) -> List[str]:
+        errors: List[str] = []
+        for arg in self.args:
+            label = getattr(arg, "resource_name", None) or getattr(arg, "name", None)
+            prefix = f"{type(arg).__name__}({label})"
+            errors.extend(f"{prefix}: {error}" for error in self._validate(arg))
+        return errors
+
+    def check(self) -> None:
+        """Raise ``pulumi.RunError`` listing every invalid arg, if any."""
+        errors = self.errors()
+        for error in errors:
+            pulumi.error(error)
+        if errors:
+            raise pulumi.RunError(
+                f"Preflight validation failed with {len(errors)} error(s)."
+            )
+
+    def _validate(self, arg: Any) -> Iterable[str]:
+        if isinstance(arg, CustomModelArgs):
+            yield from self._validate_environment(arg)
+        elif isinstance(arg, LLMBlueprintArgs):
+            yield from self._validate_llm(arg.llm_id.value)
+        elif type(arg) in _RAW_ENUM_FIELDS:
+            field, enum = _RAW_ENUM_FIELDS[type(arg)]
+            value = getattr(arg, field)
+            # Outputs are only known at deploy time.
+            if not isinstance(value, str):
+                return
+            error = _enum_error(value, enum)
+            if error:
+                yield error
+            elif enum is GlobalLLM:
+                yield from self._validate_llm(value)
+        elif not isinstance(arg, BaseModel):
+            yield "unsupported argument type for preflight validation"
+
+    def _validate_llm(self, llm_id: str) -> Iterable[str]:
+        if self.available_llms is not None and llm_id not in self.available_llms:
+            yield f"LLM {llm_id!r} is not available on this account"
+
+    def _validate_environment(self, arg: CustomModelArgs) -> Iterable[str]:
+        if self.catalog is None:
+            return
+        env = self.catalog.get(arg.base_environment_id)
+        if env is None:
+            by_name = self.catalog.get_by_name(arg.base_environment_name)
+            hint = f"; '{by_name.name}' has id {by_name.id!r}" if by_name else ""
+            yield f"unknown base_environment_id {arg.base_environment_id!r}{hint}"
+            return
+        if env.name != arg.base_environment_name:
+            yield (
+                f"base_environment_name {arg.base_environment_name!r} does not match "
+                f"environment {env.id!r} ({env.name!r})"
+            )
+        version_id = arg.base_environment_version_id
+        if version_id is not None and env.versions:
+            owner = self.catalog.environment_of_version(version_id)
+            if owner != env.id:
+                yield (
+                    f"base_environment_version_id {version_id!r} is not a version of "
+                    f"environment {env.id!r}"
+                )
+
+
+def validate_args(
+    *args: Any, catalog: Optional[RuntimeEnvironmentCatalog] = None
+) -> None:
+    """Validate args in one pass, raising ``pulumi.RunError`` with all errors."""
+    PreflightValidator(catalog).add(*args).check()
@@ -0,0 +1,181 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Waiting for deployments to become ready to serve predictions.
+
+A deployment is ready once its status is ``active`` and, if a ``probe`` is
+given (e.g. a one-row prediction), the probe succeeds; serverless
+deployments report ``active`` while their inference server is still
+starting. Polls back off exponentially with jitter, every wait is bounded
+by a deadline, deployments that error fail immediately (transient 404s and
+connection errors are retried), and the time to ready is recorded::
+
+    results = wait_for_deployments(deployment_ids, timeout=600)
+"""
+
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+import datarobot as dr
+import requests
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_READY_STATUSES = {"active"}
+_FAILED_STATUSES = {"errored", "inactive"}
+_STARTING_MESSAGE = "Inference server is starting"
+
+
+@dataclass
+class ReadinessResult:
+    deployment_id: str
+    ready: bool
+    seconds: float
+    attempts: int
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+def backoff_delays(
+    initial: float = 0.5, maximum: float = 15.0, factor: float = 2.0
+) -> Iterator[float]:
+    """Exponentially growing delays with jitter, so concurrent waiters spread out."""
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)
+        delay = min(delay * factor, maximum)
+
+
+def is_starting_error(error: BaseException) -> bool:
+    return isinstance(error, dr.errors.ServerError) and _STARTING_MESSAGE in str(error)
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    # A deployment can 404 briefly right after it is created.
+    return (
+        is_starting_error(error)
+        or isinstance(error, requests.ConnectionError)
+        or (isinstance(error, dr.errors.ClientError) and error.status_code == 404)
+    )
+
+
+def retry_until_ready(
+    func: Callable[[], T],
+    timeout: float = 300,
+    deadline: Optional[float] = None,
+    initial_delay: float = 0.5,
+    max_delay: float = 15.0,
+) -> T:
+    """Call ``func`` until it stops failing with "Inference server is starting".
+
+    ``deadline`` is an absolute ``time.monotonic()`` value and overrides
+    ``timeout``. Other errors propagate immediately.
+    """
+    deadline = deadline if deadline is not None else time.monotonic() + timeout
+    for delay in backoff_delays(initial_delay, max_delay):
+        try:
+            return func()
+        except dr.errors.ServerError as e:
+            if not is_starting_error(e):
+                raise
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Inference server did not start in time") from e
+            logger.info(f"Inference server is starting; retrying in {delay:.1f}s")
+            time.sleep(min(delay, remaining))
+    raise AssertionError("backoff_delays is infinite")
+
+
+def wait_until_ready(
+    deployment_id: str,
+    timeout: float = 300,
+    deadline: Optional[float] = None,
+    probe: Optional[Callable[[str], object]] = None,
+    initial_delay: float = 0.5,
+    max_delay: float = 15.0,
+) -> ReadinessResult:
+    """Poll a deployment until it is ready, fails, or the deadline passes.
+
+    Errors are recorded on the result rather than raised, so one deployment
+    cannot abort ``wait_for_deployments`` for the others.
+    """
+    start = time.monotonic()
+    deadline = deadline if deadline is not None else start + timeout
+    result = ReadinessResult(deployment_id, ready=False, seconds=0.0, attempts=0)
+    last_error: Optional[str] = None
+    for delay in backoff_delays(initial_delay, max_delay):
+        result.attempts += 1
+        try:
+            result.status = dr.Deployment.get(deployment_id).status
+            if result.status in _FAILED_STATUSES:
+                result.error = f"deployment is {result.status}"
+                break
+            if result.status in _READY_STATUSES:
+                if probe is not None:
+                    probe(deployment_id)
+                result.ready = True
+                break
+        except Exception as e:
+            if not _is_transient_error(e):
+                result.error = str(e)
+                break
+            last_error = str(e)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            result.error = f"not ready after {time.monotonic() - start:.0f}s" + (
+                f" (last error: {last_error})" if last_error else ""
+            )
+            break
+        time.sleep(min(delay, remaining))
+    result.seconds = time.monotonic() - start
+    logger.info(
+        f"Deployment {deployment_id} "
+        f"{'ready' if result.ready else 'not ready'} after {result.seconds:.1f}s "
+        f"({result.attempts} polls){': ' + result.error if result.error else ''}"
+    )
+    return result
+
+
+def wait_for_deployments(
+    deployment_ids: Iterable[str],
+    timeout: float = 600,
+    probe: Optional[Callable[[str], object]] = None,
+    max_workers: int = 16,
+    raise_on_failure: bool = True,
+) -> Dict[str, ReadinessResult]:
+    """Wait for many deployments concurrently under one global deadline.
+
+    Raises ``TimeoutError`` listing the deployments that are not ready,
+    unless ``raise_on_failure`` is false.
+    """
+    deployment_ids = list(deployment_ids)
+    deadline = time.monotonic() + timeout
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = dict(
+            zip(
+                deployment_ids,
+                pool.map(
+                    lambda deployment_id: wait_until_ready(
+                        deployment_id, deadline=deadline, probe=probe
+                    ),
+                    deployment_ids,
+                ),
+            )
+        )
+    failed = [result for result in results.values() if not result.ready]
+    if failed and raise_on_failure:
+        raise TimeoutError(
+            "Deployments not ready: "
+            + ", ".join(f"{r.deployment_id} ({r.error})" for r in failed)
+        )
+    return results
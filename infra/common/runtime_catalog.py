@@ -0,0 +1,189 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Local catalog of DataRobot execution environments.
+
+``RuntimeEnvironmentCatalog.sync()`` pulls every execution environment and
+its versions from the API; ``save``/``load`` persist the result as a JSON
+snapshot so programs can validate and resolve environment ids offline.
+"""
+
+import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import datarobot as dr
+from datarobot.utils.pagination import unpaginate
+from pydantic import BaseModel, PrivateAttr
+
+from . import cache
+from .globals import RuntimeEnvironment
+
+_CACHE_NAMESPACE = "runtime_catalog"
+
+
+class RuntimeEnvironmentVersion(BaseModel):
+    id: str
+    label: str | None = None
+    build_status: str | None = None
+    created_at: str | None = None
+
+
+class CatalogEnvironment(BaseModel):
+    id: str
+    name: str
+    latest_version_id: str | None = None
+    versions: list[RuntimeEnvironmentVersion] = []
+
+
+class RuntimeEnvironmentCatalog(BaseModel):
+    synced_at: float
+    endpoint: str | None = None
+    environments: list[CatalogEnvironment]
+
+    _by_id: Dict[str, CatalogEnvironment] = PrivateAttr(default_factory=dict)
+    _by_name: Dict[str, CatalogEnvironment] = PrivateAttr(default_factory=dict)
+    _version_owner: Dict[str, str] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: object) -> None:
+        for env in self.environments:
+            self._by_id[env.id] = env
+            self._by_name[env.name] = env
+            for version in env.versions:
+                self._version_owner[version.id] = env.id
+
+    def __contains__(self, environment_id: object) -> bool:
+        return environment_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self.environments)
+
+    def get(self, environment_id: str) -> Optional[CatalogEnvironment]:
+        return self._by_id.get(environment_id)
+
+    def get_by_name(self, name: str) -> Optional[CatalogEnvironment]:
+        return self._by_name.get(name)
+
+    def latest_version_id(self, environment_id: str) -> Optional[str]:
+        env = self._by_id.get(environment_id)
+        return env.latest_version_id if env else None
+
+    def environment_of_version(self, version_id: str) -> Optional[str]:
+        """Id of the environment that owns ``version_id``."""
+        return self._version_owner.get(version_id)
+
+    def resolve(
+        self, environment_id: Optional[str] = None, name: Optional[str] = None
+    ) -> RuntimeEnvironment:
+        """Find an environment by id, falling back to its name.
+
+        The fallback covers ids that went stale when an environment was
+        recreated under the same name. Raises ``KeyError`` if neither matches.
+        """
+        env = (self.get(environment_id) if environment_id else None) or (
+            self.get_by_name(name) if name else None
+        )
+        if env is None:
+            raise KeyError(
+                f"Execution environment {name or environment_id!r} is not in the catalog"
+            )
+        return RuntimeEnvironment(name=env.name, id=env.id)
+
+    @classmethod
+    def sync(
+        cls,
+        client: Optional[dr.rest.RESTClientObject] = None,
+        include_versions: bool = True,
+        max_workers: int = 8,
+    ) -> "RuntimeEnvironmentCatalog":
+        """Fetch all execution environments (and their versions) from the API."""
+        client = client or dr.client.get_client()
+        environments = list(unpaginate(dr.ExecutionEnvironment._path, {}, client))
+
+        def _versions(environment_id: str) -> List[RuntimeEnvironmentVersion]:
+            path = dr.ExecutionEnvironmentVersion._path.format(environment_id)
+            return [
+                RuntimeEnvironmentVersion(
+                    id=version["id"],
+                    label=version.get("label"),
+                    build_status=version.get("buildStatus"),
+                    created_at=version.get("created"),
+                )
+                for version in unpaginate(path, {}, client)
+            ]
+
+        versions: List[List[RuntimeEnvironmentVersion]] = [[] for _ in environments]
+        if include_versions and environments:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                versions = list(
+                    executor.map(_versions, [env["id"] for env in environments])
+                )
+
+        return cls(
+            synced_at=time.time(),
+            endpoint=client.endpoint,
+            environments=[
+                CatalogEnvironment(
+                    id=env["id"],
+                    name=env["name"],
+                    latest_version_id=(env.get("latestVersion") or {}).get("id"),
+                    versions=env_versions,
+                )
+                for env, env_versions in zip(environments, versions)
+            ],
+        )
+
+    def save(self, path: Optional[pathlib.Path] = None) -> pathlib.Path:
+        path = path or snapshot_path(self.endpoint)
+        cache.write_json(path, self.model_dump(mode="json"))
+        return path
+
+    @classmethod
+    def load(
+        cls, path: Optional[pathlib.Path] = None, max_age: Optional[float] = None
+    ) -> Optional["RuntimeEnvironmentCatalog"]:
+        """Load a snapshot, or None if it is missing or older than ``max_age`` seconds.
+
+        The default path is the snapshot of the configured client's endpoint,
+        the same one ``save`` writes after ``sync``.
+        """
+        data = cache.read_json(path or snapshot_path(), ttl=max_age)
+        return cls.model_validate(data) if data is not None else None
+
+    @classmethod
+    def load_or_sync(
+        cls, path: Optional[pathlib.Path] = None, max_age: Optional[float] = None
+    ) -> "RuntimeEnvironmentCatalog":
+        path = path or snapshot_path()
+        catalog = cls.load(path, max_age=max_age)
+        if catalog is None:
+            catalog = cls.sync()
+            catalog.save(path)
+        return catalog
+
+
+def configured_endpoint() -> str:
+    """Endpoint of the configured DataRobot client, resolved without an API call.
+
+    Uses the active client if one was created, else the SDK configuration
+    (arguments to ``dr.Client``, environment variables or drconfig.yaml),
+    else ``"default"``.
+    """
+    client = dr.client._context_client.get(dr.client._global_client)
+    if client is not None:
+        return client.endpoint
+    try:
+        return dr.client.create_drconfig().endpoint
+    except ValueError:
+        return "default"
+
+
+def snapshot_path(endpoint: Optional[str] = None) -> pathlib.Path:
+    """Default snapshot location for an endpoint (the configured one if omitted)."""
+    endpoint = (endpoint or configured_endpoint()).rstrip("/")
+    return cache.cache_dir(_CACHE_NAMESPACE) / f"{cache.cache_key(endpoint)}.json"
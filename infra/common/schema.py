@@ -5,18 +5,20 @@
 # affiliates.
 # Released under the terms of DataRobot Tool and Utility Agreement.
 
+import math
 from enum import Enum
-from typing import Optional, Any
-from pydantic import BaseModel, ConfigDict, Field
+from typing import TYPE_CHECKING, Annotated, Callable, Optional, Any
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, model_validator
 import pulumi_datarobot as datarobot
 import pulumi
 
 from .globals import (
+    DeploymentProfile,
+    GlobalDeploymentProfile,
     GlobalGuardrailTemplateName,
     GlobalLLM,
     GlobalPredictionEnvironmentPlatforms,
 )
-from datarobot.enums import VectorDatabaseChunkingMethod, VectorDatabaseEmbeddingModel
 
 
 class Stage(str, Enum):
@@ -125,6 +127,86 @@ class DeploymentArgs(BaseModel):
         datarobot.DeploymentSegmentAnalysisSettingsArgs | None
     ) = None
 
+    @model_validator(mode="after")
+    def validate_computes(self) -> "DeploymentArgs":
+        settings = self.predictions_settings
+        if settings is None:
+            return self
+        min_computes, max_computes = settings.min_computes, settings.max_computes
+        if isinstance(min_computes, int) and isinstance(max_computes, int):
+            if min_computes < 0 or max_computes < 1 or min_computes > max_computes:
+                raise ValueError(
+                    f"Invalid predictions_settings computes: min_computes="
+                    f"{min_computes}, max_computes={max_computes}"
+                )
+        return self
+
+    @classmethod
+    def from_profile(
+        cls,
+        profile: GlobalDeploymentProfile | DeploymentProfile,
+        resource_name: str,
+        label: str,
+        peak_requests_per_second: float | None = None,
+        latency_seconds: float | None = None,
+        concurrency_per_compute: int = 1,
+        **overrides: Any,
+    ) -> "DeploymentArgs":
+        """Deployment args with the serving and monitoring settings of ``profile``.
+
+        Given the expected peak load and per-request latency, checks that the
+        profile's ``max_computes`` can serve it. Any field can be overridden
+        by keyword.
+        """
+        if isinstance(profile, GlobalDeploymentProfile):
+            profile = profile.value
+        if peak_requests_per_second is not None and latency_seconds is not None:
+            needed = required_computes(
+                peak_requests_per_second, latency_seconds, concurrency_per_compute
+            )
+            if needed > profile.max_computes:
+                raise ValueError(
+                    f"{peak_requests_per_second} req/s at {latency_seconds}s needs "
+                    f"{needed} computes, but the profile allows {profile.max_computes}"
+                )
+        settings: dict[str, Any] = dict(
+            predictions_settings=datarobot.DeploymentPredictionsSettingsArgs(
+                real_time=profile.real_time,
+                min_computes=profile.min_computes,
+                max_computes=profile.max_computes,
+            ),
+            predictions_data_collection_settings=(
+                datarobot.DeploymentPredictionsDataCollectionSettingsArgs(
+                    enabled=profile.data_collection
+                )
+            ),
+            drift_tracking_settings=datarobot.DeploymentDriftTrackingSettingsArgs(
+                feature_drift_enabled=profile.feature_drift,
+                target_drift_enabled=profile.target_drift,
+            ),
+            challenger_models_settings=(
+                datarobot.DeploymentChallengerModelsSettingsArgs(
+                    enabled=profile.challengers
+                )
+            ),
+            segment_analysis_settings=datarobot.DeploymentSegmentAnalysisSettingsArgs(
+                enabled=profile.segment_analysis
+            ),
+        )
+        return cls(
+            resource_name=resource_name, label=label, **{**settings, **overrides}
+        )
+
+
+def required_computes(
+    peak_requests_per_second: float,
+    latency_seconds: float,
+    concurrency_per_compute: int = 1,
+) -> int:
+    """Computes needed to serve a peak load (Little's law: in-flight = rate x latency)."""
+    in_flight = peak_requests_per_second * latency_seconds
+    return max(1, math.ceil(in_flight / concurrency_per_compute))
+
 
 class CustomModelGuardConfigurationArgs(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -159,9 +241,44 @@ class LLMBlueprintArgs(BaseModel):
     vector_database_settings: VectorDatabaseSettings
 
 
+def _datarobot_enum(name: str) -> Callable[[Any], Any]:
+    """Coerce to a ``datarobot.enums`` member, importing the SDK only when used.
+
+    Importing ``datarobot.enums`` initializes the whole DataRobot SDK, which
+    would otherwise dominate the import time of this module.
+    """
+
+    def validate(value: Any) -> Any:
+        if value is None:
+            return None
+        import datarobot.enums
+
+        return getattr(datarobot.enums, name)(value)
+
+    return validate
+
+
+if TYPE_CHECKING:
+    from datarobot.enums import (
+        VectorDatabaseChunkingMethod,
+        VectorDatabaseEmbeddingModel,
+    )
+
+    EmbeddingModel = Optional[VectorDatabaseEmbeddingModel]
+    ChunkingMethod = Optional[VectorDatabaseChunkingMethod]
+else:
+    # Same types at runtime, checked by a validator that imports the SDK lazily.
+    EmbeddingModel = Annotated[
+        Any, AfterValidator(_datarobot_enum("VectorDatabaseEmbeddingModel"))
+    ]
+    ChunkingMethod = Annotated[
+        Any, AfterValidator(_datarobot_enum("VectorDatabaseChunkingMethod"))
+    ]
+
+
 class ChunkingParameters(BaseModel):
-    embedding_model: VectorDatabaseEmbeddingModel | None = None
-    chunking_method: VectorDatabaseChunkingMethod | None = None
+    embedding_model: EmbeddingModel = None
+    chunking_method: ChunkingMethod = None
     chunk_size: int | None = Field(ge=128, le=512)
     chunk_overlap_percentage: int | None = None
     separators: list[str] | None = None
@@ -0,0 +1,62 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Small values carried between deployments in the stack's own state.
+
+Helpers that need to know what the previous deployment of this stack did
+(e.g. which content digest a custom model holds) ``record`` it and read it
+back with ``previous`` on the next run. All recorded values are kept in a
+single stack output, ``STATE_OUTPUT``, as a map keyed by the recording
+helper, so they do not mix with the program's own ``pulumi.export``
+outputs; ``pulumi stack output`` will still list it, and programs should
+not export under that name. The output lives in Pulumi state, so every
+machine deploying the stack sees the same values, and a value is only
+recorded once the resource it describes has been created or updated
+successfully.
+
+``previous`` reads the outputs of the last deployment synchronously
+through the engine's ``readStackOutputs`` builtin, so the value can decide
+resource options such as ``ignore_changes`` at registration time.
+"""
+
+import functools
+from typing import Any, Dict
+
+import pulumi
+
+STATE_OUTPUT = "datarobotPulumiState"
+
+# Values recorded by this program run, exported together as STATE_OUTPUT.
+_recorded: Dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def previous_outputs() -> Dict[str, Any]:
+    """Outputs of the last deployment of the current stack, read once per program."""
+    parts = [pulumi.get_organization(), pulumi.get_project(), pulumi.get_stack()]
+    name = "/".join(part for part in parts if part)
+    try:
+        result = pulumi.runtime.invoke("pulumi:pulumi:readStackOutputs", {"name": name})
+    except Exception as e:
+        # No usable prior state means nothing can be assumed to be deployed.
+        pulumi.log.debug(f"Could not read the outputs of stack {name}: {e}")
+        return {}
+    return dict((result.value or {}).get("outputs") or {})
+
+
+def previous(key: str) -> Any:
+    """Value recorded under ``key`` by the last deployment, or None."""
+    state = previous_outputs().get(STATE_OUTPUT)
+    return state.get(key) if isinstance(state, dict) else None
+
+
+def record(key: str, value: pulumi.Input[Any]) -> None:
+    """Record ``value`` under ``key`` for the next deployment of this stack."""
+    _recorded[key] = value
+    # Stack outputs are only registered when the program ends, so
+    # re-exporting the growing map keeps a single output.
+    pulumi.export(STATE_OUTPUT, dict(_recorded))
@@ -0,0 +1,155 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Streaming upload of large custom model artifacts.
+
+The custom model versions API takes individual files in a multipart body,
+so nothing needs to be zipped: files are streamed straight from disk and
+never materialized in memory. Large file sets are split into batches of
+bounded size; the first batch creates the version and each following batch
+extends it (a minor version built from the previous one), so a failed
+batch is retried on its own instead of re-sending every file.
+
+Batches are sent one after another because every batch builds on the
+version created by the one before; the API offers no way to upload parts
+of a single version concurrently.
+"""
+
+import contextlib
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+import datarobot as dr
+import requests
+from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_BYTES = 2 * 1024**3
+
+
+@dataclass
+class UploadStats:
+    bytes_sent: int = 0
+    seconds: float = 0.0
+    files: int = 0
+    batches: int = 0
+    retries: int = 0
+    version_ids: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Average upload throughput in bytes per second."""
+        return self.bytes_sent / self.seconds if self.seconds else 0.0
+
+
+def batch_files(
+    files: List[Tuple[str, str]], max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES
+) -> List[List[Tuple[str, str]]]:
+    """Group (local_path, remote_path) pairs into batches of at most ``max_batch_bytes``.
+
+    A single file larger than the limit gets a batch of its own.
+    """
+    batches: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    current_size = 0
+    for local, remote in sorted(files, key=lambda pair: os.path.getsize(pair[0])):
+        size = os.path.getsize(local)
+        if current and current_size + size > max_batch_bytes:
+            batches.append(current)
+            current, current_size = [], 0
+        current.append((local, remote))
+        current_size += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _send_batch(
+    client: dr.rest.RESTClientObject,
+    method: str,
+    custom_model_id: str,
+    batch: List[Tuple[str, str]],
+    form_data: List[Tuple[str, str]],
+    progress: Optional[Callable[[int], None]],
+) -> Tuple[str, int]:
+    with contextlib.ExitStack() as stack:
+        fields: List[Tuple[str, Any]] = list(form_data)
+        for local, remote in batch:
+            f = stack.enter_context(open(local, "rb"))
+            fields.append(("file", (os.path.basename(remote), f)))
+            fields.append(("filePath", remote))
+        encoder = MultipartEncoder(fields=fields)
+        monitor = MultipartEncoderMonitor(
+            encoder,
+            (lambda m: progress(m.bytes_read)) if progress else None,
+        )
+        response = client.request(
+            method,
+            dr.CustomModelVersion._path.format(custom_model_id),
+            data=monitor,
+            headers={"Content-Type": monitor.content_type},
+        )
+        return response.json()["id"], encoder.len
+
+
+def upload_custom_model_version(
+    custom_model_id: str,
+    files: List[Tuple[str, str]],
+    base_environment_id: str,
+    base_environment_version_id: Optional[str] = None,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    max_retries: int = 3,
+    progress: Optional[Callable[[int], None]] = None,
+) -> Tuple[str, UploadStats]:
+    """Create a custom model version from ``files`` with streamed, retried batches.
+
+    Returns the id of the final version (pass it to ``CustomModelDeployment``
+    as ``custom_model_version_id``) and upload statistics. ``progress`` is
+    called with the number of bytes sent so far in the current batch.
+    """
+    if not files:
+        raise ValueError("At least one file is required to create a version")
+    client = dr.client.get_client()
+    stats = UploadStats(files=len(files))
+    environment: List[Tuple[str, str]] = [("baseEnvironmentId", base_environment_id)]
+    if base_environment_version_id:
+        environment.append(("baseEnvironmentVersionId", base_environment_version_id))
+
+    start = time.monotonic()
+    for index, batch in enumerate(batch_files(files, max_batch_bytes)):
+        first = index == 0
+        method = "POST" if first else "PATCH"
+        form_data = [("isMajorUpdate", str(first))] + environment
+        for attempt in range(max_retries + 1):
+            try:
+                version_id, sent = _send_batch(
+                    client, method, custom_model_id, batch, form_data, progress
+                )
+                break
+            except (dr.errors.ServerError, requests.ConnectionError) as e:
+                if attempt == max_retries:
+                    raise
+                stats.retries += 1
+                delay = min(2**attempt, 30) * (0.5 + random.random())
+                logger.warning(
+                    f"Upload batch {index + 1} failed ({e}); retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+        stats.version_ids.append(version_id)
+        stats.bytes_sent += sent
+        stats.batches += 1
+        stats.seconds = time.monotonic() - start
+        logger.info(
+            f"Uploaded batch {index + 1} ({len(batch)} files, {sent} bytes) "
+            f"at {stats.throughput / 1024**2:.1f} MiB/s"
+        )
+    return stats.version_ids[-1], stats
@@ -0,0 +1,235 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Incremental refreshes of vector databases.
+
+A vector database built with a ``parentVectorDatabaseId`` is a new version
+of its parent: DataRobot compares the new dataset with the parent's
+documents and only chunks and embeds added or changed documents, dropping
+removed ones. The provider cannot create such versions, so
+``VectorDatabaseVersion`` is a dynamic resource that does. It keeps the
+versions built from a base vector database in Pulumi state, so every
+machine deploying the stack agrees on the latest one, creates a version
+parented to the latest whenever the dataset's documents change, and
+deletes the versions it created on destroy.
+"""
+
+import logging
+import os
+import time
+import uuid
+import zipfile
+from typing import Any, Dict, List, Optional
+
+import pulumi
+import pulumi.dynamic
+
+from . import cache
+from .manifest import corpus_manifest
+
+logger = logging.getLogger(__name__)
+
+_VECTOR_DATABASES_PATH = "genai/vectorDatabases/"
+# Embedding a large corpus takes hours.
+_TIMEOUT_SECONDS = 4 * 60 * 60
+_POLL_INTERVAL_SECONDS = 10
+
+
+def document_index(file_path: str) -> Dict[str, str]:
+    """``{document: checksum}`` of a RAG corpus.
+
+    Zip archives are indexed per member using the CRC stored in the archive,
+    so nothing is decompressed, and directories per file; any other file
+    counts as a single document. Directories and other files are hashed
+    through their ``corpus_manifest``, so files already hashed in this or an
+    earlier run (e.g. by ``RAGCustomModel``'s content tracking) are not
+    read again.
+    """
+    if not os.path.isdir(file_path) and zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path) as archive:
+            return {
+                info.filename: f"{info.CRC:08x}:{info.file_size}"
+                for info in archive.infolist()
+                if not info.is_dir()
+            }
+    manifest = corpus_manifest(file_path)
+    return {entry["remote"]: entry["sha256"] for entry in manifest.entries.values()}
+
+
+def documents_digest(file_path: str) -> str:
+    """Digest of the documents of a corpus; re-packing the same documents keeps it."""
+    return cache.cache_key(sorted(document_index(file_path).items()))
+
+
+def _wait_for_vector_database(
+    client: Any,
+    vector_database_id: str,
+    timeout: float = _TIMEOUT_SECONDS,
+    poll_interval: float = _POLL_INTERVAL_SECONDS,
+) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        data = client.get(f"{_VECTOR_DATABASES_PATH}{vector_database_id}/").json()
+        status = data.get("executionStatus")
+        if status == "COMPLETED":
+            return
+        if status == "ERROR":
+            raise RuntimeError(
+                f"Vector database {vector_database_id} failed: "
+                f"{data.get('errorMessage') or 'unknown error'}"
+            )
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Vector database {vector_database_id} not ready after {timeout}s"
+            )
+        time.sleep(poll_interval)
+
+
+def _create_version(
+    client: Any, parent_id: str, dataset_id: str, name: Optional[str]
+) -> str:
+    logger.info(f"Refreshing vector database {parent_id} from dataset {dataset_id}")
+    payload: Dict[str, Any] = {
+        "datasetId": dataset_id,
+        "parentVectorDatabaseId": parent_id,
+        # Blueprints and custom models are repointed by the Pulumi program.
+        "updateLlmBlueprints": False,
+        "updateDeployments": False,
+    }
+    if name:
+        payload["name"] = name
+    version_id = client.post(_VECTOR_DATABASES_PATH, json=payload).json()["id"]
+    _wait_for_vector_database(client, version_id)
+    return version_id
+
+
+class _VectorDatabaseVersionProvider(pulumi.dynamic.ResourceProvider):
+    # The SDK is imported in the provider process only, where the DataRobot
+    # client is configured from the environment or drconfig.yaml.
+
+    def create(self, props: Dict[str, Any]) -> pulumi.dynamic.CreateResult:
+        import datarobot as dr
+
+        client = dr.client.get_client()
+        base_id = props["base_vector_database_id"]
+        base = client.get(f"{_VECTOR_DATABASES_PATH}{base_id}/").json()
+        version_ids: List[str] = []
+        # The base was usually just built from this dataset.
+        if base.get("datasetId") != props["dataset_id"]:
+            version_ids.append(
+                _create_version(client, base_id, props["dataset_id"], props.get("name"))
+            )
+        return pulumi.dynamic.CreateResult(
+            uuid.uuid4().hex, self._outs(props, base_id, version_ids)
+        )
+
+    def diff(
+        self, _id: str, olds: Dict[str, Any], news: Dict[str, Any]
+    ) -> pulumi.dynamic.DiffResult:
+        replaces = (
+            ["base_vector_database_id"]
+            if olds.get("base_vector_database_id") != news["base_vector_database_id"]
+            else []
+        )
+        changes = bool(replaces) or any(
+            olds.get(key) != news.get(key)
+            for key in ("dataset_id", "documents_digest", "name")
+        )
+        return pulumi.dynamic.DiffResult(changes=changes, replaces=replaces)
+
+    def update(
+        self, _id: str, olds: Dict[str, Any], news: Dict[str, Any]
+    ) -> pulumi.dynamic.UpdateResult:
+        import datarobot as dr
+
+        client = dr.client.get_client()
+        version_ids = list(olds["version_ids"])
+        latest = olds["vector_database_id"]
+        if olds.get("documents_digest") != news["documents_digest"]:
+            latest = _create_version(
+                client, latest, news["dataset_id"], news.get("name")
+            )
+            version_ids.append(latest)
+        elif version_ids and news.get("name") and olds.get("name") != news["name"]:
+            # The base is named by its own resource; only rename our latest.
+            client.patch(
+                f"{_VECTOR_DATABASES_PATH}{latest}/", json={"name": news["name"]}
+            )
+        return pulumi.dynamic.UpdateResult(
+            self._outs(news, olds["base_vector_database_id"], version_ids)
+        )
+
+    def delete(self, _id: str, props: Dict[str, Any]) -> None:
+        import datarobot as dr
+
+        client = dr.client.get_client()
+        # Newest first, so no version outlives its parent.
+        for version_id in reversed(props["version_ids"]):
+            try:
+                client.delete(f"{_VECTOR_DATABASES_PATH}{version_id}/")
+            except dr.errors.ClientError as e:
+                if e.status_code != 404:
+                    raise
+
+    @staticmethod
+    def _outs(
+        props: Dict[str, Any], base_id: str, version_ids: List[str]
+    ) -> Dict[str, Any]:
+        return {
+            **props,
+            "vector_database_id": version_ids[-1] if version_ids else base_id,
+            "version_ids": version_ids,
+        }
+
+
+class VectorDatabaseVersion(pulumi.dynamic.Resource):
+    """The latest version of a vector database, refreshed as its corpus changes.
+
+    Parameters:
+    -----------
+    resource_name : str
+        The name of this Pulumi resource.
+    base_vector_database_id : pulumi.Input[str]
+        Vector database the versions descend from; keep its ``datasetId``
+        in ``ignore_changes`` so a new dataset does not replace it.
+    dataset_id : pulumi.Input[str]
+        Dataset of the current corpus.
+    documents_digest : pulumi.Input[str]
+        ``documents_digest`` of the current corpus; a new version is only
+        built when it changes.
+    name : Optional[pulumi.Input[str]]
+        Name given to new versions; renaming also renames the latest version
+        created by this resource.
+    opts : Optional[pulumi.ResourceOptions]
+        Optional Pulumi resource options.
+    """
+
+    vector_database_id: pulumi.Output[str]
+    version_ids: pulumi.Output[List[str]]
+
+    def __init__(
+        self,
+        resource_name: str,
+        base_vector_database_id: pulumi.Input[str],
+        dataset_id: pulumi.Input[str],
+        documents_digest: pulumi.Input[str],
+        name: Optional[pulumi.Input[str]] = None,
+        opts: Optional[pulumi.ResourceOptions] = None,
+    ):
+        super().__init__(
+            _VectorDatabaseVersionProvider(),
+            resource_name,
+            {
+                "base_vector_database_id": base_vector_database_id,
+                "dataset_id": dataset_id,
+                "documents_digest": documents_digest,
+                "name": name,
+                "vector_database_id": None,
+                "version_ids": None,
+            },
+            opts,
+        )
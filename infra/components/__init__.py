@@ -0,0 +1,42 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+"""Pulumi components.
+
+Components are exported lazily: ``from infra.components import DRCredential``
+only imports ``dr_credential`` and its dependencies, not every component.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .custom_model_deployment import CustomModelDeployment
+    from .custom_model_deployment_fleet import CustomModelDeploymentFleet
+    from .dr_credential import DRCredential
+    from .rag_custom_model import RAGCustomModel
+
+_EXPORTS = {
+    "CustomModelDeployment": ".custom_model_deployment",
+    "CustomModelDeploymentFleet": ".custom_model_deployment_fleet",
+    "DRCredential": ".dr_credential",
+    "RAGCustomModel": ".rag_custom_model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
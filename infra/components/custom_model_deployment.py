@@ -7,11 +7,53 @@
 
 import pulumi
 import pulumi_datarobot as datarobot
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
+from ..common.manifest import ContentTracker
 from ..common.schema import DeploymentArgs, RegisteredModelArgs, CustomModelArgs
 
 
+class RegisteredModelRegistry:
+    """Share one RegisteredModel per custom model version across components.
+
+    Pass the same registry to several ``CustomModelDeployment`` instances
+    (e.g. the same model deployed to dev, stage and prod environments) and
+    only the first one registers the version; the others deploy that
+    registered model version. Versions are matched by value for plain ids
+    and by identity for ``pulumi.Output`` ids. The shared model is parented
+    to the first component that registers it, so keep that component first
+    to avoid moving the resource between runs.
+    """
+
+    def __init__(self) -> None:
+        self._models: Dict[Any, Tuple[Any, datarobot.RegisteredModel]] = {}
+
+    @staticmethod
+    def _key(custom_model_version_id: pulumi.Input[str]) -> Any:
+        if isinstance(custom_model_version_id, str):
+            return custom_model_version_id
+        return id(custom_model_version_id)
+
+    def get_or_create(
+        self,
+        custom_model_version_id: pulumi.Input[str],
+        registered_model_args: RegisteredModelArgs,
+        opts: Optional[pulumi.ResourceOptions] = None,
+    ) -> datarobot.RegisteredModel:
+        key = self._key(custom_model_version_id)
+        if key not in self._models:
+            # Keep the version id alive so its id() cannot be reused.
+            self._models[key] = (
+                custom_model_version_id,
+                datarobot.RegisteredModel(
+                    custom_model_version_id=custom_model_version_id,
+                    **registered_model_args.model_dump(mode="json"),
+                    opts=opts,
+                ),
+            )
+        return self._models[key][1]
+
+
 class CustomModelDeployment(pulumi.ComponentResource):
     def __init__(
         self,
@@ -21,6 +63,7 @@ class CustomModelDeployment(pulumi.ComponentResource):
         deployment_args: DeploymentArgs,
         custom_model_version_id: Optional[pulumi.Input[str]] = None,
         custom_model_args: Optional[CustomModelArgs] = None,
+        registered_model_registry: Optional[RegisteredModelRegistry] = None,
         opts: Optional[pulumi.ResourceOptions] = None,
     ):
         """
@@ -42,8 +85,20 @@ class CustomModelDeployment(pulumi.ComponentResource):
             Arguments for registering the model.
         deployment_args : DeploymentArgs
             Arguments for creating the Deployment.
+        registered_model_registry : Optional[RegisteredModelRegistry]
+            Registry used to reuse the RegisteredModel of another component
+            deploying the same custom model version. When reused,
+            ``registered_model_args`` of this component are ignored.
         opts : Optional[pulumi.ResourceOptions]
             Optional Pulumi resource options.
+
+        When ``custom_model_args`` is given, the model files are tracked with a
+        content manifest: if they are unchanged since the last successful
+        deployment of this stack, the provider is told to ignore the file
+        properties instead of repackaging and diffing them. The deployed
+        digest is kept in the stack's ``datarobotPulumiState`` output (see
+        ``infra.common.stack_state``), keyed by the custom model's type and
+        resource name.
         """
         super().__init__(
             "custom:datarobot:CustomModelDeployment", resource_name, None, opts
@@ -56,15 +111,31 @@ class CustomModelDeployment(pulumi.ComponentResource):
             )
 
         if custom_model_args:
+            tracker = ContentTracker(
+                "datarobot:index/customModel:CustomModel",
+                custom_model_args.resource_name,
+                custom_model_args.folder_path,
+                custom_model_args.files,
+            )
             custom_model_version_id = datarobot.CustomModel(
                 **custom_model_args.model_dump(exclude_none=True),
-                opts=pulumi.ResourceOptions(parent=self),
+                opts=pulumi.ResourceOptions(
+                    parent=self, ignore_changes=tracker.ignore_changes
+                ),
             ).version_id
-        self.registered_model = datarobot.RegisteredModel(
-            custom_model_version_id=custom_model_version_id,
-            **registered_model_args.model_dump(mode="json"),
-            opts=pulumi.ResourceOptions(parent=self),
-        )
+            tracker.record(custom_model_version_id)
+        if registered_model_registry is not None:
+            self.registered_model = registered_model_registry.get_or_create(
+                custom_model_version_id,
+                registered_model_args,
+                opts=pulumi.ResourceOptions(parent=self),
+            )
+        else:
+            self.registered_model = datarobot.RegisteredModel(
+                custom_model_version_id=custom_model_version_id,
+                **registered_model_args.model_dump(mode="json"),
+                opts=pulumi.ResourceOptions(parent=self),
+            )
 
         self.deployment = datarobot.Deployment(
             prediction_environment_id=prediction_environment.id,
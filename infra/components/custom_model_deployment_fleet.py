@@ -0,0 +1,125 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import pulumi
+import pulumi_datarobot as datarobot
+
+from ..common.schema import CustomModelArgs, DeploymentArgs, RegisteredModelArgs
+from .custom_model_deployment import CustomModelDeployment, RegisteredModelRegistry
+
+FleetEntry = Tuple[
+    Union[CustomModelArgs, pulumi.Input[str]], RegisteredModelArgs, DeploymentArgs
+]
+
+
+class CustomModelDeploymentFleet(pulumi.ComponentResource):
+    def __init__(
+        self,
+        resource_name: str,
+        entries: Sequence[FleetEntry],
+        prediction_environment: datarobot.PredictionEnvironment,
+        max_in_flight: int = 10,
+        registered_model_registry: Optional[RegisteredModelRegistry] = None,
+        opts: Optional[pulumi.ResourceOptions] = None,
+    ):
+        """
+        Deploy many custom models to a shared prediction environment.
+
+        Entries are chained in ``max_in_flight`` lanes: entry ``i`` depends on
+        entry ``i - max_in_flight``, so at most ``max_in_flight`` deployments
+        are being created at any time regardless of the engine's
+        ``--parallel`` setting, keeping bulk rollouts under API rate limits.
+
+        Parameters:
+        -----------
+        resource_name : str
+            The name of this Pulumi resource.
+        entries : Sequence[FleetEntry]
+            ``(custom_model_args or custom_model_version_id, registered_model_args,
+            deployment_args)`` for each deployment. ``deployment_args.resource_name``
+            names the per-entry ``CustomModelDeployment`` and must be unique;
+            duplicates raise ``ValueError``.
+        prediction_environment : datarobot.PredictionEnvironment
+            The PredictionEnvironment shared by all deployments.
+        max_in_flight : int
+            Maximum number of deployments created concurrently.
+        registered_model_registry : Optional[RegisteredModelRegistry]
+            Registry shared with other components; by default the fleet uses
+            its own, so entries deploying the same custom model version share
+            one RegisteredModel.
+        opts : Optional[pulumi.ResourceOptions]
+            Optional Pulumi resource options.
+        """
+        super().__init__(
+            "custom:datarobot:CustomModelDeploymentFleet", resource_name, None, opts
+        )
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        names = [deployment_args.resource_name for _, _, deployment_args in entries]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            # They would collide in Pulumi and overwrite each other in the outputs.
+            raise ValueError(
+                f"Duplicate deployment resource names: {', '.join(duplicates)}"
+            )
+
+        registered_model_registry = (
+            registered_model_registry or RegisteredModelRegistry()
+        )
+        self.names: List[str] = []
+        self.deployments: List[CustomModelDeployment] = []
+        for index, (model, registered_model_args, deployment_args) in enumerate(
+            entries
+        ):
+            depends_on = (
+                [self.deployments[index - max_in_flight]]
+                if index >= max_in_flight
+                else []
+            )
+            self.names.append(deployment_args.resource_name)
+            self.deployments.append(
+                CustomModelDeployment(
+                    deployment_args.resource_name,
+                    registered_model_args=registered_model_args,
+                    prediction_environment=prediction_environment,
+                    deployment_args=deployment_args,
+                    custom_model_args=(
+                        model if isinstance(model, CustomModelArgs) else None
+                    ),
+                    custom_model_version_id=(
+                        None if isinstance(model, CustomModelArgs) else model
+                    ),
+                    registered_model_registry=registered_model_registry,
+                    opts=pulumi.ResourceOptions(parent=self, depends_on=depends_on),
+                )
+            )
+
+        self.register_outputs(
+            {
+                "deployment_ids": self.deployment_ids,
+                "registered_model_version_ids": self.registered_model_version_ids,
+            }
+        )
+
+    def _by_name(
+        self, outputs: List[pulumi.Output[str]]
+    ) -> pulumi.Output[Dict[str, str]]:
+        return pulumi.Output.all(*outputs).apply(
+            lambda values: dict(zip(self.names, values))
+        )
+
+    @property
+    def deployment_ids(self) -> pulumi.Output[Dict[str, str]]:
+        """Deployment ids keyed by ``deployment_args.resource_name``."""
+        return self._by_name([d.deployment_id for d in self.deployments])
+
+    @property
+    def registered_model_version_ids(self) -> pulumi.Output[Dict[str, str]]:
+        """Registered model version ids keyed by ``deployment_args.resource_name``."""
+        return self._by_name([d.registered_model_version_id for d in self.deployments])
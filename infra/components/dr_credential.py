@@ -5,51 +5,148 @@
 # affiliates.
 # Released under the terms of DataRobot Tool and Utility Agreement.
 
-from typing import Optional, List, Union
+import functools
+import hashlib
+import json
+import secrets
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
 import pulumi
 import pulumi_datarobot as datarobot
 
 from ..common.schema import (
     CredentialArgs,
 )
-from docsassist.credentials import (
-    LLMCredentials,
-    AzureOpenAICredentials,
-    GoogleLLMCredentials,
-)
+
+if TYPE_CHECKING:
+    # docsassist is imported on first use so that importing this module stays cheap.
+    from docsassist.credentials import LLMCredentials
+
+
+Credential = Union[datarobot.ApiTokenCredential, datarobot.GoogleCloudCredential]
+
+
+class CredentialPool:
+    """Share one DataRobot credential per secret across ``DRCredential`` components.
+
+    Credentials are keyed by a keyed BLAKE2b fingerprint of their type and
+    secret, so the pool never holds plain secrets, only their fingerprints,
+    and fingerprints are useless outside the program. Pass the same pool to
+    every ``DRCredential`` (e.g. dozens of RAG models using one Azure OpenAI
+    key) and only the first creates the credential; the others share its
+    id. Secrets given as ``pulumi.Output`` are matched by identity.
+
+    Shared credentials belong to the stack rather than to a component, so
+    their URN depends only on their ``resource_name``: reordering or removing
+    the components that use one does not replace it. Components sharing a
+    secret must agree on its ``CredentialArgs``.
+    """
+
+    def __init__(self) -> None:
+        self._key = secrets.token_bytes(hashlib.blake2b.MAX_KEY_SIZE)
+        self._credentials: Dict[str, Tuple[Any, Dict[str, Any], Credential]] = {}
+
+    def fingerprint(self, credential_type: str, secret: Any) -> str:
+        if isinstance(secret, pulumi.Output):
+            material = f"output:{id(secret)}"
+        else:
+            material = json.dumps(secret, sort_keys=True, default=str)
+        return hashlib.blake2b(
+            f"{credential_type}\0{material}".encode(), key=self._key, digest_size=16
+        ).hexdigest()
+
+    def get_or_create(
+        self,
+        credential_type: str,
+        secret: Any,
+        create: Callable[[], Credential],
+        credential_args: Optional[CredentialArgs] = None,
+    ) -> Credential:
+        """The credential for ``secret``, created with ``create`` on first use.
+
+        Raises ``ValueError`` if ``credential_args`` differ from those the
+        credential was created with.
+        """
+        fingerprint = self.fingerprint(credential_type, secret)
+        args = credential_args.model_dump() if credential_args is not None else {}
+        if fingerprint not in self._credentials:
+            # Keep an Output alive so its id() cannot be reused; plain
+            # secrets are not retained.
+            output = secret if isinstance(secret, pulumi.Output) else None
+            self._credentials[fingerprint] = (output, args, create())
+        _, shared_args, credential = self._credentials[fingerprint]
+        if args and args != shared_args:
+            raise ValueError(
+                f"Credential {args.get('resource_name')!r} shares its secret with "
+                f"{shared_args.get('resource_name')!r} but has different args"
+            )
+        return credential
 
 
 class DRCredential(pulumi.ComponentResource):
     """DR Credential for use with a custom deployment or app.
 
     Abstracts creation of the appropriate credential type, structuring runtime parameters.
+    Components given the same ``credential_pool`` share credentials with the same secret;
+    those credentials belong to the stack (see ``CredentialPool``), others to the component.
     """
 
     def __init__(
         self,
         resource_name: str,
-        credential: LLMCredentials,
+        credential: "LLMCredentials",
         credential_args: CredentialArgs,
+        credential_pool: Optional[CredentialPool] = None,
         opts: Optional[pulumi.ResourceOptions] = None,
     ):
+        from docsassist.credentials import AzureOpenAICredentials, GoogleLLMCredentials
+
         super().__init__("custom:datarobot:DRCredential", resource_name, None, opts)
 
+        if credential_pool is None:
+            credential_pool = CredentialPool()
+            credential_opts = pulumi.ResourceOptions(parent=self)
+        else:
+            # Alias the URN shared credentials had while parented to the first
+            # component using them.
+            credential_opts = pulumi.ResourceOptions(
+                aliases=[pulumi.Alias(parent=self)]
+            )
+
         self.credential_raw = credential
-        self.credential: Union[
-            datarobot.ApiTokenCredential, datarobot.GoogleCloudCredential
-        ]
+        self.credential: Credential
         if isinstance(self.credential_raw, AzureOpenAICredentials):
-            self.credential = datarobot.ApiTokenCredential(
-                **credential_args.model_dump(),
-                api_token=credential.api_key,
-                opts=pulumi.ResourceOptions(parent=self),
+            self.credential = credential_pool.get_or_create(
+                "api_token",
+                credential.api_key,
+                lambda: datarobot.ApiTokenCredential(
+                    **credential_args.model_dump(),
+                    api_token=credential.api_key,
+                    opts=credential_opts,
+                ),
+                credential_args,
             )
         elif isinstance(self.credential_raw, GoogleLLMCredentials):
-            self.credential = datarobot.GoogleCloudCredential(
-                **credential_args.model_dump(),
-                # TODO: update & test once declarative api support arrives
-                source_file=credential.service_account_key,
-                opts=pulumi.ResourceOptions(parent=self),
+            self.credential = credential_pool.get_or_create(
+                "google_cloud",
+                credential.service_account_key,
+                lambda: datarobot.GoogleCloudCredential(
+                    **credential_args.model_dump(),
+                    # TODO: update & test once declarative api support arrives
+                    source_file=credential.service_account_key,
+                    opts=credential_opts,
+                ),
+                credential_args,
             )
         else:
             raise ValueError("Unsupported credential type")
@@ -64,6 +161,19 @@ class DRCredential(pulumi.ComponentResource):
     def runtime_parameter_values(
         self,
     ) -> List[datarobot.CustomModelRuntimeParameterValueArgs]:
+        """Runtime parameters exposing this credential to a custom model.
+
+        Built once per component; each access returns a new list of the same
+        (shared) arg objects.
+        """
+        return list(self._runtime_parameter_values)
+
+    @functools.cached_property
+    def _runtime_parameter_values(
+        self,
+    ) -> List[datarobot.CustomModelRuntimeParameterValueArgs]:
+        from docsassist.credentials import AzureOpenAICredentials, GoogleLLMCredentials
+
         if isinstance(self.credential_raw, AzureOpenAICredentials):
             runtime_parameter_values = [
                 datarobot.CustomModelRuntimeParameterValueArgs(
@@ -99,3 +209,27 @@ class DRCredential(pulumi.ComponentResource):
         else:
             raise NotImplementedError("Unsupported credential type")
         return runtime_parameter_values
+
+
+def batch_runtime_parameter_values(
+    credentials: Mapping[str, Sequence[DRCredential]],
+) -> Dict[str, List[datarobot.CustomModelRuntimeParameterValueArgs]]:
+    """Runtime parameters for many models at once, keyed like ``credentials``.
+
+    Each model gets the parameters of all its credentials. Models using the
+    same credentials share one list, so treat the lists as read-only.
+    """
+    combined: Dict[
+        Tuple[int, ...], List[datarobot.CustomModelRuntimeParameterValueArgs]
+    ] = {}
+    values = {}
+    for name, model_credentials in credentials.items():
+        key = tuple(id(credential) for credential in model_credentials)
+        if key not in combined:
+            combined[key] = [
+                value
+                for credential in model_credentials
+                for value in credential._runtime_parameter_values
+            ]
+        values[name] = combined[key]
+    return values
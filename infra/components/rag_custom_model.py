@@ -5,10 +5,11 @@
 # affiliates.
 # Released under the terms of DataRobot Tool and Utility Agreement.
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 import pulumi
 import pulumi_datarobot as datarobot
 
+from ..common.manifest import ContentTracker, corpus_digest, corpus_manifest
 from ..common.schema import (
     CustomModelArgs,
     DatasetArgs,
@@ -18,6 +19,90 @@ from ..common.schema import (
 )
 
 
+class DatasetRegistry:
+    """Share datasets and vector databases built from identical corpora.
+
+    Datasets are keyed by use case and ``corpus_digest`` of the source file,
+    and vector databases additionally by chunking parameters, so RAG models
+    in a program that use the same corpus upload and embed it once, whether
+    it is uploaded or was ingested beforehand. Resources owned by another
+    stack can be seeded with ``add_existing`` (e.g. via
+    ``DatasetFromFile.get``/``VectorDatabase.get`` with ids from a
+    ``pulumi.StackReference``).
+    """
+
+    def __init__(self) -> None:
+        self._datasets: Dict[Tuple[Any, str], datarobot.DatasetFromFile] = {}
+        self._vector_databases: Dict[Tuple[Any, str, str], datarobot.VectorDatabase] = (
+            {}
+        )
+        self._versions: Dict[int, Tuple[datarobot.VectorDatabase, Any]] = {}
+        # Keep keyed use cases alive so their id() cannot be reused.
+        self._use_cases: List[datarobot.UseCase] = []
+
+    def _use_case_key(self, use_case: datarobot.UseCase) -> int:
+        if all(uc is not use_case for uc in self._use_cases):
+            self._use_cases.append(use_case)
+        return id(use_case)
+
+    @staticmethod
+    def _chunking_key(vector_database_args: VectorDatabaseArgs) -> str:
+        return vector_database_args.chunking_parameters.model_dump_json()
+
+    def add_existing(
+        self,
+        use_case: datarobot.UseCase,
+        content_hash: str,
+        dataset: datarobot.DatasetFromFile,
+        vector_database: Optional[datarobot.VectorDatabase] = None,
+        vector_database_args: Optional[VectorDatabaseArgs] = None,
+    ) -> None:
+        """Register resources built elsewhere; ``content_hash`` is ``corpus_digest`` of their corpus."""
+        key = (self._use_case_key(use_case), content_hash)
+        self._datasets[key] = dataset
+        if vector_database is not None and vector_database_args is not None:
+            self._vector_databases[
+                key + (self._chunking_key(vector_database_args),)
+            ] = vector_database
+
+    def dataset(
+        self,
+        use_case: datarobot.UseCase,
+        content_hash: str,
+        create: Any,
+    ) -> datarobot.DatasetFromFile:
+        key = (self._use_case_key(use_case), content_hash)
+        if key not in self._datasets:
+            self._datasets[key] = create()
+        return self._datasets[key]
+
+    def vector_database(
+        self,
+        use_case: datarobot.UseCase,
+        content_hash: str,
+        vector_database_args: VectorDatabaseArgs,
+        create: Any,
+    ) -> datarobot.VectorDatabase:
+        key = (
+            self._use_case_key(use_case),
+            content_hash,
+            self._chunking_key(vector_database_args),
+        )
+        if key not in self._vector_databases:
+            self._vector_databases[key] = create()
+        return self._vector_databases[key]
+
+    def vector_database_version(
+        self, vector_database: datarobot.VectorDatabase, create: Any
+    ) -> Any:
+        """The ``VectorDatabaseVersion`` refreshing a shared vector database."""
+        key = id(vector_database)
+        if key not in self._versions:
+            # Keep the vector database alive so its id() cannot be reused.
+            self._versions[key] = (vector_database, create())
+        return self._versions[key][1]
+
+
 class RAGCustomModel(pulumi.ComponentResource):
     def __init__(
         self,
@@ -30,9 +115,37 @@ class RAGCustomModel(pulumi.ComponentResource):
         runtime_parameter_values: List[datarobot.CustomModelRuntimeParameterValueArgs],
         guard_configurations: List[datarobot.CustomModelGuardConfigurationArgs],
         custom_model_args: CustomModelArgs,
+        dataset_registry: Optional[DatasetRegistry] = None,
+        incremental_refresh: bool = False,
+        dataset_id: Optional[pulumi.Input[str]] = None,
         opts: Optional[pulumi.ResourceOptions] = None,
     ):
+        """
+        Build a RAG custom model from a document dataset.
+
+        The dataset file is identified by its content hash. Pass a shared
+        ``dataset_registry`` to reuse the dataset and vector database of
+        other RAG models with the same corpus; the shared resources are
+        parented to the first component that creates them. Moving or
+        re-writing the file with identical content does not re-upload it or
+        rebuild the vector database. The digest of the uploaded file is kept
+        in the stack's ``datarobotPulumiState`` output (see
+        ``infra.common.stack_state``) so unchanged uploads are not diffed.
+
+        With ``incremental_refresh``, a changed dataset does not replace the
+        vector database: a new version of it is built that only re-embeds
+        the added or changed documents, and the LLM blueprint and custom
+        model are repointed to that version (``vector_database_id``). The
+        versions are held in the stack's state by a ``VectorDatabaseVersion``
+        resource and deleted with it.
+
+        Corpora too large for a single upload are ingested beforehand with
+        ``infra.common.ingest.ingest_dataset``; pass the resulting
+        ``dataset_id`` and the ingested directory or archive as
+        ``dataset_args.file_path``.
+        """
         super().__init__("custom:datarobot:RAGCustomModel", resource_name, None, opts)
+        dataset_registry = dataset_registry or DatasetRegistry()
 
         self.playground = datarobot.Playground(
             use_case_id=use_case.id,
@@ -40,22 +153,76 @@ class RAGCustomModel(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self),
         )
 
-        self.vdb_dataset = datarobot.DatasetFromFile(
-            use_case_ids=[use_case.id],
-            **dataset_args.model_dump(mode="json"),
-            opts=pulumi.ResourceOptions(parent=self),
+        def create_dataset() -> datarobot.DatasetFromFile:
+            if dataset_id is not None:
+                return datarobot.DatasetFromFile.get(
+                    dataset_args.resource_name,
+                    id=dataset_id,
+                    opts=pulumi.ResourceOptions(parent=self),
+                )
+            dataset = datarobot.DatasetFromFile(
+                use_case_ids=[use_case.id],
+                **dataset_args.model_dump(mode="json"),
+                opts=pulumi.ResourceOptions(
+                    parent=self, ignore_changes=tracker.ignore_changes
+                ),
+            )
+            tracker.record(dataset.id)
+            return dataset
+
+        if dataset_id is not None:
+            self.content_hash = corpus_digest(dataset_args.file_path)
+        else:
+            tracker = ContentTracker(
+                "datarobot:index/datasetFromFile:DatasetFromFile",
+                dataset_args.resource_name,
+                properties=["filePath"],
+                manifest=corpus_manifest(dataset_args.file_path),
+            )
+            self.content_hash = tracker.manifest.digest
+
+        self.vdb_dataset = dataset_registry.dataset(
+            use_case, self.content_hash, create_dataset
         )
 
-        self.vector_database = datarobot.VectorDatabase(
-            dataset_id=self.vdb_dataset.id,
-            use_case_id=use_case.id,
-            **vector_database_args.model_dump(mode="json"),
-            opts=pulumi.ResourceOptions(parent=self),
+        self.vector_database = dataset_registry.vector_database(
+            use_case,
+            self.content_hash,
+            vector_database_args,
+            lambda: datarobot.VectorDatabase(
+                dataset_id=self.vdb_dataset.id,
+                use_case_id=use_case.id,
+                **vector_database_args.model_dump(mode="json"),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    ignore_changes=["datasetId"] if incremental_refresh else None,
+                ),
+            ),
         )
 
+        self.vector_database_id: pulumi.Output[str] = self.vector_database.id
+        if incremental_refresh:
+            from ..common.vector_database import (
+                VectorDatabaseVersion,
+                documents_digest,
+            )
+
+            self.vector_database_version = dataset_registry.vector_database_version(
+                self.vector_database,
+                lambda: VectorDatabaseVersion(
+                    f"{vector_database_args.resource_name}-version",
+                    base_vector_database_id=self.vector_database.id,
+                    dataset_id=self.vdb_dataset.id,
+                    documents_digest=documents_digest(dataset_args.file_path),
+                    name=vector_database_args.name,
+                    opts=pulumi.ResourceOptions(parent=self),
+                ),
+            )
+            self.vector_database_id = self.vector_database_version.vector_database_id
+
         self.llm_blueprint = datarobot.LlmBlueprint(
             playground_id=self.playground.id,
-            vector_database_id=self.vector_database.id,
+            vector_database_id=self.vector_database_id,
             **llm_blueprint_args.model_dump(mode="json"),
             opts=pulumi.ResourceOptions(parent=self),
         )
@@ -72,7 +239,7 @@ class RAGCustomModel(pulumi.ComponentResource):
             {
                 "playground_id": self.playground.id,
                 "dataset_id": self.vdb_dataset.id,
-                "vector_database_id": self.vector_database.id,
+                "vector_database_id": self.vector_database_id,
                 "llm_blueprint_id": self.llm_blueprint.id,
                 "id": self.custom_model.id,
                 "version_id": self.custom_model.version_id,
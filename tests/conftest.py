@@ -9,7 +9,6 @@
 
 import os
 import subprocess
-import time
 import datarobot as dr
 import uuid
 import pandas as pd
@@ -18,6 +17,10 @@ import logging
 from dotenv import dotenv_values
 from datarobot_predict.deployment import predict
 
+from infra.common.batch_scoring import score
+from infra.common.prediction_client import AsyncPredictionClient
+from infra.common.readiness import retry_until_ready, wait_for_deployments
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +38,14 @@ def session_env_vars():
     return None
 
 
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    """Point the infra on-disk cache at an empty per-test directory."""
+    root = tmp_path / "cache"
+    monkeypatch.setenv("DATAROBOT_PULUMI_CACHE_DIR", str(root))
+    return root
+
+
 def run_command(command):
     print(f"Running command: {' '.join(command)}")
     proc = subprocess.run(command, check=False, text=True, capture_output=True)
@@ -80,47 +91,52 @@ def dr_client(session_env_vars):
 def predict_with_retry(
     deployment, data_frame, max_wait_seconds=300, retry_interval_seconds=5
 ):
-    start_time = time.time()
-    while True:
-        try:
-            prediction = predict(deployment, data_frame=data_frame)
-            return prediction
-        except dr.errors.ServerError as e:
-            if "Inference server is starting" in str(e):
-                elapsed_time = time.time() - start_time
-                if elapsed_time > max_wait_seconds:
-                    raise TimeoutError(
-                        f"Server did not start within {max_wait_seconds} seconds"
-                    )
-                logger.info(
-                    f"Server is starting. Retrying in {retry_interval_seconds} seconds..."
-                )
-                time.sleep(retry_interval_seconds)
-            else:
-                # If it's a different ServerError, re-raise it
-                raise
+    return retry_until_ready(
+        lambda: predict(deployment, data_frame=data_frame),
+        timeout=max_wait_seconds,
+        initial_delay=retry_interval_seconds,
+        max_delay=retry_interval_seconds,
+    )
 
 
 @pytest.fixture
-def make_prediction(dr_client):
-    def predict_function(input_json, deployment_id):
-        deployment = dr.Deployment.get(deployment_id)
-        predict_df = pd.DataFrame(input_json)
-        while True:
-            try:
-                prediction = predict_with_retry(
-                    deployment, data_frame=predict_df
-                ).dataframe
-                break
-            except dr.errors.ServerError as e:
-                if "Inference server is starting" in str(e):
-                    continue
+def wait_for_ready(dr_client):
+    """Wait for deployments concurrently; returns per-deployment time-to-ready."""
+
+    def wait_function(deployment_ids, timeout=600, probe=None):
+        return wait_for_deployments(deployment_ids, timeout=timeout, probe=probe)
+
+    return wait_function
 
+
+@pytest.fixture
+def score_predictions(dr_client):
+    """Score a DataFrame or CSV/Parquet path, returning all predictions in input order."""
+
+    def score_function(data, deployment_id, **kwargs):
+        kwargs.setdefault("predict_fn", predict_with_retry)
+        return pd.concat(score(deployment_id, data, **kwargs))
+
+    return score_function
+
+
+@pytest.fixture
+def make_prediction(score_predictions):
+    def predict_function(input_json, deployment_id):
+        prediction = score_predictions(pd.DataFrame(input_json), deployment_id)
         return prediction.to_dict(orient="records")[0]
 
     return predict_function
 
 
+@pytest.fixture
+def prediction_client(dr_client):
+    """Pooled asyncio prediction client; drive it with ``asyncio.run``."""
+    client = AsyncPredictionClient(max_concurrency=16)
+    yield client
+    client.close()
+
+
 @pytest.fixture
 def custom_py():
     return """\
@@ -0,0 +1,154 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import pytest
+
+from infra.common.app_source import diff_index, sync_application_source
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """Application source versions holding ``{file_path: (item_id, content)}``."""
+
+    endpoint = "https://app.example.com/api/v2"
+
+    def __init__(self):
+        self.versions = {}
+        self.posts = []
+        self.patches = []
+
+    def post(self, url, json):
+        self.posts.append(json)
+        version_id = f"v{len(self.versions) + 1}"
+        base = self.versions.get(json.get("baseVersion"), {})
+        self.versions[version_id] = {
+            path: (f"{version_id}-{path}", content)
+            for path, (_, content) in base.items()
+        }
+        return FakeResponse({"id": version_id})
+
+    def get(self, url):
+        version_id = url.rstrip("/").rsplit("/", 1)[-1]
+        return FakeResponse(
+            {
+                "items": [
+                    {"filePath": path, "id": item_id}
+                    for path, (item_id, _) in self.versions[version_id].items()
+                ]
+            }
+        )
+
+    def patch(self, url, data, headers):
+        version_id = url.rstrip("/").rsplit("/", 1)[-1]
+        items = self.versions[version_id]
+        fields = data.fields
+        uploads = [value for name, value in fields if name == "file"]
+        paths = [value for name, value in fields if name == "filePath"]
+        deletes = [value for name, value in fields if name == "filesToDelete"]
+        for path, (_, f) in zip(paths, uploads):
+            items[path] = (f"{version_id}-{path}", f.read())
+        for item_id in deletes:
+            del items[next(p for p, (i, _) in items.items() if i == item_id)]
+        self.patches.append({"upload": paths, "delete": deletes})
+
+    def files(self, version_id):
+        return {
+            path: content for path, (_, content) in self.versions[version_id].items()
+        }
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    root = tmp_path / "app"
+    (root / "static").mkdir(parents=True)
+    (root / "app.py").write_text("print('v1')\n")
+    (root / "static" / "logo.png").write_bytes(b"png")
+    return root
+
+
+def test_diff_index():
+    previous = {"app.py": "1", "static/logo.png": "2", "old.txt": "3"}
+    current = {"app.py": "1", "static/logo.png": "22", "new.txt": "4"}
+
+    diff = diff_index(previous, current)
+
+    assert diff.upload == ["new.txt", "static/logo.png"]
+    assert diff.delete == ["old.txt"]
+    assert diff
+    assert not diff_index(current, dict(current))
+
+
+def test_first_sync_uploads_everything(cache_root, app_dir):
+    client = FakeClient()
+
+    version_id, diff = sync_application_source("source", str(app_dir), client=client)
+
+    assert client.posts == [{}]
+    assert diff.upload == ["app.py", "static/logo.png"]
+    assert client.files(version_id) == {
+        "app.py": b"print('v1')\n",
+        "static/logo.png": b"png",
+    }
+
+
+def test_changes_are_based_on_the_last_version(cache_root, app_dir):
+    client = FakeClient()
+    first, _ = sync_application_source("source", str(app_dir), client=client)
+
+    (app_dir / "app.py").write_text("print('v2')\n")
+    (app_dir / "static" / "logo.png").unlink()
+    (app_dir / "new.txt").write_text("new")
+    second, diff = sync_application_source("source", str(app_dir), client=client)
+
+    assert client.posts[-1] == {"baseVersion": first}
+    assert client.patches[-1] == {
+        "upload": ["app.py", "new.txt"],
+        "delete": [f"{second}-static/logo.png"],
+    }
+    assert client.files(second) == {"app.py": b"print('v2')\n", "new.txt": b"new"}
+
+
+def test_unchanged_folder_creates_no_version(cache_root, app_dir):
+    client = FakeClient()
+    first, _ = sync_application_source("source", str(app_dir), client=client)
+
+    again, diff = sync_application_source("source", str(app_dir), client=client)
+
+    assert again == first and not diff
+    assert len(client.posts) == 1
+
+
+def test_stale_index_resyncs_against_the_remote_version(cache_root, app_dir):
+    client = FakeClient()
+    sync_application_source("source", str(app_dir), client=client)
+    # Another machine created a version the local index does not know about.
+    remote = client.post("", json={}).json()["id"]
+    client.versions[remote] = {
+        "app.py": (f"{remote}-app.py", b"print('other')\n"),
+        "stray.txt": (f"{remote}-stray.txt", b"stray"),
+    }
+
+    version_id, diff = sync_application_source(
+        "source", str(app_dir), base_version_id=remote, client=client
+    )
+
+    assert client.posts[-1] == {"baseVersion": remote}
+    assert diff.upload == ["app.py", "static/logo.png"]
+    assert diff.delete == ["stray.txt"]
+    assert client.files(version_id) == {
+        "app.py": b"print('v1')\n",
+        "static/logo.png": b"png",
+    }
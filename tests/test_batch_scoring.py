@@ -0,0 +1,116 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import types
+
+import datarobot as dr
+import pandas as pd
+import pytest
+
+from infra.common import batch_scoring
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame(
+        {"x": range(100), "text": ["some text"] * 100},
+        index=[f"row{i}" for i in range(100)],
+    )
+
+
+@pytest.fixture
+def batch_jobs(monkeypatch):
+    jobs = []
+
+    def fake_score(deployment_id, intake_settings, output_settings, **kwargs):
+        jobs.append(kwargs)
+        intake = intake_settings["file"]
+        frame = intake if isinstance(intake, pd.DataFrame) else pd.read_csv(intake)
+        pd.DataFrame({"prediction": frame["x"] * 2}).to_csv(
+            output_settings["path"], index=False
+        )
+
+    monkeypatch.setattr(dr.BatchPredictionJob, "score", fake_score)
+    return jobs
+
+
+@pytest.fixture
+def fake_deployment(monkeypatch):
+    monkeypatch.setattr(
+        dr.Deployment, "get", lambda deployment_id: types.SimpleNamespace()
+    )
+
+
+def fake_predict(deployment, data_frame):
+    # Like datarobot_predict, predictions come back with a fresh index.
+    predictions = pd.DataFrame({"prediction": data_frame["x"].to_numpy() * 2})
+    return types.SimpleNamespace(dataframe=predictions)
+
+
+def test_score_batch_keeps_the_input_index(data, batch_jobs):
+    predictions = pd.concat(
+        batch_scoring.score_batch("deployment", data, max_chunk_bytes=200)
+    )
+
+    pd.testing.assert_index_equal(predictions.index, data.index)
+    assert predictions["prediction"].tolist() == (data["x"] * 2).tolist()
+
+
+def test_score_batch_indexes_files_by_position(tmp_path, data, batch_jobs):
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+
+    predictions = pd.concat(
+        batch_scoring.score_batch("deployment", str(path), max_chunk_bytes=200)
+    )
+
+    pd.testing.assert_index_equal(predictions.index, pd.RangeIndex(100))
+
+
+def test_score_realtime_keeps_the_input_index(data, fake_deployment):
+    predictions = pd.concat(
+        batch_scoring.score_realtime(
+            "deployment", data, max_chunk_bytes=200, predict_fn=fake_predict
+        )
+    )
+
+    pd.testing.assert_index_equal(predictions.index, data.index)
+    assert predictions["prediction"].tolist() == (data["x"] * 2).tolist()
+
+
+@pytest.mark.parametrize("method", ["auto", "realtime"])
+def test_score_realtime_options(data, fake_deployment, batch_jobs, method):
+    predictions = pd.concat(
+        batch_scoring.score(
+            "deployment",
+            data,
+            method=method,
+            predict_fn=fake_predict,
+            batch_options={"passthrough_columns": ["x"]},
+        )
+    )
+
+    assert len(predictions) == len(data)
+    assert not batch_jobs
+
+
+def test_score_batch_options(data, batch_jobs, monkeypatch):
+    monkeypatch.setattr(batch_scoring, "BATCH_THRESHOLD_BYTES", 0)
+
+    predictions = pd.concat(
+        batch_scoring.score(
+            "deployment",
+            data,
+            predict_fn=fake_predict,
+            batch_options={"passthrough_columns": ["x"]},
+        )
+    )
+
+    assert batch_jobs == [{"passthrough_columns": ["x"]}]
+    pd.testing.assert_index_equal(predictions.index, data.index)
@@ -0,0 +1,144 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import random
+import zipfile
+
+import numpy as np
+import pytest
+
+from infra.common import chunking
+from infra.common.chunking import (
+    _windows,
+    estimate_chunking,
+    load_documents,
+    split_lengths,
+)
+from infra.common.schema import ChunkingParameters
+
+
+def count_characters(pieces):
+    """One token per character, so expected chunks are easy to work out."""
+    return np.array([len(piece) for piece in pieces], dtype=np.int64)
+
+
+@pytest.mark.parametrize(
+    "lengths, chunk_size, overlap, expected",
+    [
+        ([3, 3, 3, 3], 6, 0, [6, 6]),
+        ([3, 3, 3, 3], 6, 3, [6, 6, 6]),
+        ([2, 2, 2], 10, 0, [6]),
+        # A piece larger than a chunk still makes progress.
+        ([10, 2], 6, 0, [10, 2]),
+        ([], 6, 0, []),
+    ],
+)
+def test_windows(lengths, chunk_size, overlap, expected):
+    assert _windows(np.array(lengths, dtype=np.int64), chunk_size, overlap) == expected
+
+
+def test_split_lengths_packs_pieces_greedily():
+    assert split_lengths("aaaa bbbb cccc", 10, 0, [" ", ""], count_characters) == [
+        10,
+        4,
+    ]
+
+
+def test_split_lengths_recurses_into_oversized_pieces():
+    text = "ab " + "x" * 25 + " cd"
+
+    assert split_lengths(text, 10, 0, [" ", ""], count_characters) == [3, 10, 10, 6, 2]
+
+
+def test_split_lengths_covers_text_without_overlap():
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abc", k=rng.randint(1, 30))) for _ in range(500)]
+    text = "\n\n".join(" ".join(words[i : i + 20]) for i in range(0, 500, 20))
+
+    lengths = split_lengths(text, 64, 0, chunking.DEFAULT_SEPARATORS, count_characters)
+
+    assert sum(lengths) == len(text)
+    assert max(lengths) <= 64
+
+
+def test_estimate_chunking():
+    documents = ["word " * 100, "word " * 30]
+
+    estimate = estimate_chunking(
+        documents,
+        ChunkingParameters(chunk_size=128, chunk_overlap_percentage=0),
+        count_tokens=count_characters,
+        cost_per_million_tokens=2.0,
+    )
+
+    assert estimate.documents == 2
+    assert estimate.chunks == 6
+    assert estimate.total_tokens == 650
+    assert estimate.max_tokens == 125
+    assert estimate.embedding_model == chunking.DEFAULT_EMBEDDING_MODEL
+    assert estimate.embedding_seconds == pytest.approx(
+        650 / chunking.EMBEDDING_TOKENS_PER_SECOND[chunking.DEFAULT_EMBEDDING_MODEL]
+    )
+    assert estimate.embedding_cost == pytest.approx(650 / 1e6 * 2.0)
+
+
+def test_overlap_adds_chunks():
+    documents = ["word " * 500]
+
+    def chunks(overlap):
+        parameters = ChunkingParameters(
+            chunk_size=128, chunk_overlap_percentage=overlap
+        )
+        return estimate_chunking(documents, parameters, count_characters).chunks
+
+    assert chunks(25) > chunks(0)
+
+
+def test_word_estimate_without_tiktoken(monkeypatch):
+    monkeypatch.setattr(chunking, "tiktoken", None)
+
+    assert chunking.token_counter()(["hello, world", ""]).tolist() == [4, 0]
+
+
+def test_load_documents_skips_binary_members(tmp_path):
+    path = tmp_path / "corpus.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("a.txt", "alpha")
+        archive.writestr("docs/", "")
+        archive.writestr("b.pdf", b"%PDF\xff\xfe")
+
+    assert load_documents(str(path)) == ["alpha"]
+
+
+def test_load_documents_walks_directories(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "docs").mkdir(parents=True)
+    (corpus / "b.txt").write_text("beta")
+    (corpus / "docs" / "a.txt").write_text("alpha")
+    (corpus / "c.pdf").write_bytes(b"%PDF\xff\xfe")
+
+    assert load_documents(str(corpus)) == ["beta", "alpha"]
+
+
+def test_estimate_chunking_dispatches_on_method():
+    documents = ["word " * 100]
+    recursive = ChunkingParameters(chunking_method="recursive", chunk_size=128)
+    default = ChunkingParameters(chunk_size=128)
+
+    assert estimate_chunking(documents, recursive, count_characters) == (
+        estimate_chunking(documents, default, count_characters)
+    )
+    with pytest.raises(ValueError, match="semantic"):
+        estimate_chunking(
+            documents,
+            ChunkingParameters.model_construct(
+                chunking_method="semantic", chunk_size=128
+            ),
+            count_characters,
+        )
@@ -0,0 +1,110 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import pulumi
+import pulumi_datarobot as datarobot
+import pytest
+
+from infra.common.schema import DeploymentArgs, RegisteredModelArgs
+from infra.components import custom_model_deployment_fleet
+from infra.components.custom_model_deployment_fleet import CustomModelDeploymentFleet
+
+
+class FleetMocks(pulumi.runtime.Mocks):
+    def new_resource(self, args):
+        return [f"{args.name}-id", {**args.inputs, "versionId": f"{args.name}-v"}]
+
+    def call(self, args):
+        return {}
+
+
+@pytest.fixture
+def prediction_environment():
+    pulumi.runtime.set_mocks(FleetMocks(), "project", "stack")
+    return datarobot.PredictionEnvironment(
+        "prediction-environment", platform="datarobotServerless"
+    )
+
+
+def entries(*names):
+    return [
+        (
+            f"version-{name}",
+            RegisteredModelArgs(resource_name=f"registered-{name}", name=name),
+            DeploymentArgs(resource_name=name, label=name),
+        )
+        for name in names
+    ]
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 2, 3])
+def test_deployments_are_chained_in_lanes(
+    prediction_environment, monkeypatch, max_in_flight
+):
+    depends_on = {}
+
+    class RecordingDeployment(pulumi.ComponentResource):
+        def __init__(self, resource_name, opts, **kwargs):
+            super().__init__("test:Deployment", resource_name, None, opts)
+            self.deployment_id = pulumi.Output.from_input(f"{resource_name}-id")
+            self.registered_model_version_id = self.deployment_id
+            depends_on[resource_name] = [
+                dependency._name for dependency in opts.depends_on
+            ]
+
+    monkeypatch.setattr(
+        custom_model_deployment_fleet, "CustomModelDeployment", RecordingDeployment
+    )
+    names = [f"d{i}" for i in range(5)]
+
+    CustomModelDeploymentFleet(
+        f"fleet-{max_in_flight}",
+        entries(*names),
+        prediction_environment,
+        max_in_flight=max_in_flight,
+    )
+
+    assert depends_on == {
+        name: [names[i - max_in_flight]] if i >= max_in_flight else []
+        for i, name in enumerate(names)
+    }
+
+
+@pulumi.runtime.test
+def test_outputs_are_keyed_by_resource_name(prediction_environment):
+    fleet = CustomModelDeploymentFleet(
+        "fleet", entries("a", "b", "c"), prediction_environment, max_in_flight=2
+    )
+
+    def check(values):
+        deployment_ids, version_ids = values
+        assert deployment_ids == {"a": "a-id", "b": "b-id", "c": "c-id"}
+        assert version_ids == {
+            "a": "registered-a-v",
+            "b": "registered-b-v",
+            "c": "registered-c-v",
+        }
+
+    return pulumi.Output.all(
+        fleet.deployment_ids, fleet.registered_model_version_ids
+    ).apply(check)
+
+
+def test_duplicate_resource_names_are_rejected(prediction_environment):
+    with pytest.raises(ValueError, match="Duplicate deployment resource names: a"):
+        CustomModelDeploymentFleet(
+            "fleet-duplicates", entries("a", "b", "a"), prediction_environment
+        )
+
+
+def test_max_in_flight_must_be_positive(prediction_environment):
+    with pytest.raises(ValueError, match="max_in_flight"):
+        CustomModelDeploymentFleet(
+            "fleet-empty", entries("a"), prediction_environment, max_in_flight=0
+        )
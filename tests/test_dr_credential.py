@@ -0,0 +1,91 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import pulumi
+import pytest
+
+from infra.common.schema import CredentialArgs
+from infra.components.dr_credential import CredentialPool
+
+
+def test_fingerprint_is_stable_within_a_pool():
+    pool = CredentialPool()
+
+    assert pool.fingerprint("api_token", "secret") == pool.fingerprint(
+        "api_token", "secret"
+    )
+    assert pool.fingerprint("gcp", {"a": 1, "b": 2}) == pool.fingerprint(
+        "gcp", {"b": 2, "a": 1}
+    )
+
+
+def test_fingerprint_separates_type_and_secret():
+    pool = CredentialPool()
+
+    assert pool.fingerprint("api_token", "secret") != pool.fingerprint(
+        "api_token", "other"
+    )
+    assert pool.fingerprint("api_token", "secret") != pool.fingerprint("gcp", "secret")
+
+
+def test_fingerprint_is_keyed_per_pool_and_hides_the_secret():
+    fingerprint = CredentialPool().fingerprint("api_token", "secret")
+
+    assert fingerprint != CredentialPool().fingerprint("api_token", "secret")
+    assert "secret" not in fingerprint
+    assert len(fingerprint) == 32
+
+
+def test_fingerprint_matches_outputs_by_identity():
+    pool = CredentialPool()
+    secret = pulumi.Output.secret("secret")
+
+    assert pool.fingerprint("api_token", secret) == pool.fingerprint(
+        "api_token", secret
+    )
+    assert pool.fingerprint("api_token", secret) != pool.fingerprint(
+        "api_token", pulumi.Output.secret("secret")
+    )
+
+
+def test_get_or_create_shares_credentials():
+    pool = CredentialPool()
+    created = []
+
+    def create():
+        created.append(object())
+        return created[-1]
+
+    first = pool.get_or_create("api_token", "secret", create)
+
+    assert pool.get_or_create("api_token", "secret", create) is first
+    assert pool.get_or_create("api_token", "other", create) is not first
+    assert len(created) == 2
+
+
+def test_get_or_create_rejects_conflicting_args():
+    pool = CredentialPool()
+    args = CredentialArgs(resource_name="openai", name="OpenAI")
+    credential = pool.get_or_create("api_token", "secret", object, args)
+
+    assert pool.get_or_create("api_token", "secret", object, args) is credential
+    with pytest.raises(ValueError, match="different args"):
+        pool.get_or_create(
+            "api_token",
+            "secret",
+            object,
+            CredentialArgs(resource_name="openai-2", name="OpenAI"),
+        )
+
+
+def test_get_or_create_does_not_retain_plain_secrets():
+    pool = CredentialPool()
+    pool.get_or_create("api_token", "very-secret", object)
+
+    assert "very-secret" not in repr(pool.__dict__)
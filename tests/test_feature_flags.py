@@ -0,0 +1,151 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import time
+
+import datarobot as dr
+import pytest
+
+from infra.common import feature_flags
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """Entitlement endpoint that rejects ``invalid`` flags with a 422."""
+
+    def __init__(self, values, invalid=(), endpoint="https://app.example.com/api/v2"):
+        self.values = values
+        self.invalid = set(invalid)
+        self.endpoint = endpoint
+        self.token = "token"
+        self.requests = []
+
+    def post(self, url, json):
+        flags = [entitlement["name"] for entitlement in json["entitlements"]]
+        self.requests.append(flags)
+        rejected = [flag for flag in flags if flag in self.invalid]
+        if rejected:
+            raise dr.errors.ClientError(
+                "invalid flags",
+                422,
+                json={"errors": {str(i): flag for i, flag in enumerate(rejected)}},
+            )
+        return FakeResponse(
+            {
+                "entitlements": [
+                    {"name": flag, "value": self.values[flag]} for flag in flags
+                ]
+            }
+        )
+
+
+def test_evaluations_are_cached_for_ttl(cache_root):
+    client = FakeClient({"A": True, "B": False})
+
+    first = feature_flags.eval_feature_flag_statuses(["A", "B"], 60, client)
+    second = feature_flags.eval_feature_flag_statuses(["B", "A"], 60, client)
+
+    assert first == second == ({"A": True, "B": False}, [])
+    assert len(client.requests) == 1
+
+
+def test_zero_ttl_disables_cache(cache_root):
+    client = FakeClient({"A": True})
+
+    feature_flags.eval_feature_flag_statuses(["A"], 0, client)
+    feature_flags.eval_feature_flag_statuses(["A"], 0, client)
+
+    assert len(client.requests) == 2
+    assert not list((cache_root / "feature_flags").glob("*.json"))
+
+
+def test_cache_ttl_resolution(monkeypatch):
+    monkeypatch.setenv(feature_flags.FEATURE_FLAG_CACHE_TTL_ENV, "30")
+
+    assert feature_flags.get_cache_ttl() == 30
+    assert feature_flags.get_cache_ttl(5) == 5
+
+
+def test_cache_is_keyed_by_endpoint(cache_root):
+    first = FakeClient({"A": True}, endpoint="https://one.example.com/api/v2")
+    second = FakeClient({"A": False}, endpoint="https://two.example.com/api/v2")
+
+    assert feature_flags.eval_feature_flag_statuses(["A"], 60, first)[0] == {"A": True}
+    assert feature_flags.eval_feature_flag_statuses(["A"], 60, second)[0] == {
+        "A": False
+    }
+
+
+def test_invalid_flags_are_recorded_and_skipped(cache_root):
+    client = FakeClient({"A": True}, invalid=["GONE"])
+
+    status, invalid = feature_flags.eval_feature_flag_statuses(["A", "GONE"], 0, client)
+    assert status == {"A": True}
+    assert invalid == ["GONE"]
+    assert feature_flags.get_known_invalid_flags(client) == ["GONE"]
+
+    client.requests.clear()
+    feature_flags.eval_feature_flag_statuses(["A", "GONE"], 0, client)
+    assert client.requests == [["A"]]
+
+
+def test_invalid_flags_expire(cache_root, monkeypatch):
+    client = FakeClient({"A": True, "NEW": True}, invalid=["NEW"])
+    feature_flags.eval_feature_flag_statuses(["A", "NEW"], 0, client)
+
+    # The flag is rolled out later; once the entry expires it is sent again.
+    client.invalid.clear()
+    later = time.time() + feature_flags.DEFAULT_INVALID_FLAG_TTL + 1
+    monkeypatch.setattr(feature_flags.time, "time", lambda: later)
+    client.requests.clear()
+
+    status, invalid = feature_flags.eval_feature_flag_statuses(["A", "NEW"], 0, client)
+    assert status == {"A": True, "NEW": True}
+    assert invalid == []
+    assert client.requests == [["A", "NEW"]]
+
+
+def test_invalid_flag_ttl_resolution(monkeypatch):
+    monkeypatch.setenv(feature_flags.INVALID_FLAG_TTL_ENV, "0")
+
+    assert feature_flags.get_invalid_flag_ttl() == 0
+    assert feature_flags.get_invalid_flag_ttl(10) == 10
+
+
+@pytest.mark.parametrize("ttl", [0, 60])
+def test_corrections(cache_root, ttl):
+    client = FakeClient({"A": True, "B": True})
+
+    corrections, invalid = feature_flags.eval_feature_flags(
+        {"A": True, "B": False}, ttl, client
+    )
+
+    assert corrections == [("B", False)]
+    assert invalid == []
+
+
+def test_cached_corrections_are_confirmed(cache_root):
+    client = FakeClient({"A": False})
+    desired = {"A": True}
+
+    assert feature_flags.eval_feature_flags(desired, 60, client) == ([("A", True)], [])
+    assert len(client.requests) == 1
+
+    # The user enables the flag and reruns within the TTL.
+    client.values["A"] = True
+    assert feature_flags.eval_feature_flags(desired, 60, client) == ([], [])
+    assert feature_flags.eval_feature_flags(desired, 60, client) == ([], [])
+    assert len(client.requests) == 2
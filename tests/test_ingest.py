@@ -0,0 +1,157 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import types
+
+import datarobot as dr
+import pytest
+
+from infra.common import ingest
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeClient:
+    endpoint = "https://app.example.com/api/v2"
+
+    def __init__(self, fail_parts=(), gone_stages=()):
+        self.parts = {}
+        self.fail_parts = set(fail_parts)
+        self.gone_stages = set(gone_stages)
+        self.stages = []
+        self.finalized = []
+
+    def _check_stage(self, url):
+        stage_id = url.split("/")[1]
+        if stage_id in self.gone_stages:
+            raise dr.errors.ClientError("not found", 404)
+
+    def post(self, url, data=None):
+        if url == "dataStages/":
+            self.stages.append(f"stage{len(self.stages) + 1}")
+            return FakeResponse({"id": self.stages[-1]})
+        self._check_stage(url)
+        self.finalized.append(url.split("/")[1])
+        return FakeResponse({"parts": []})
+
+    def put(self, url, data, headers):
+        self._check_stage(url)
+        part_number = int(url.rstrip("/").rsplit("/", 1)[-1])
+        if part_number in self.fail_parts:
+            raise RuntimeError(f"part {part_number} lost")
+        self.parts[part_number] = data.to_string()
+
+
+@pytest.fixture
+def datasets(monkeypatch):
+    created = []
+
+    def create_from_datastage(stage_id, use_cases=None):
+        created.append((stage_id, dr.client.get_client()))
+        return types.SimpleNamespace(id=f"dataset-{stage_id}")
+
+    monkeypatch.setattr(dr.Dataset, "create_from_datastage", create_from_datastage)
+    return created
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "corpus"
+    root.mkdir()
+    for i in range(20):
+        (root / f"doc{i}.txt").write_bytes(bytes(range(256)) * 8)
+    return root
+
+
+def test_build_archive_is_deterministic(cache_root, corpus, tmp_path):
+    first = ingest.build_archive(str(corpus)).read_bytes()
+    ingest.build_archive(str(corpus)).unlink()
+
+    assert ingest.build_archive(str(corpus)).read_bytes() == first
+    archive = tmp_path / "corpus.zip"
+    assert ingest.build_archive(str(archive)) == archive
+
+
+def test_ingest_uses_the_given_client(cache_root, corpus, datasets):
+    client = FakeClient()
+
+    result = ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=client)
+
+    assert result.dataset_id == "dataset-stage1"
+    assert result.parts > 1
+    assert client.stages == ["stage1"]
+    assert client.finalized == ["stage1"]
+    assert sorted(client.parts) == list(range(1, result.parts + 1))
+    assert datasets == [("stage1", client)]
+
+
+def test_ingest_deletes_built_archive(cache_root, corpus, datasets):
+    ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=FakeClient())
+
+    assert not list((cache_root / "ingest" / "archives").iterdir())
+
+
+def test_ingest_resumes_and_then_reuses_dataset(cache_root, corpus, datasets):
+    failing = FakeClient(fail_parts=[2])
+    with pytest.raises(RuntimeError):
+        ingest.ingest_dataset(
+            str(corpus), max_part_bytes=4096, max_workers=1, client=failing
+        )
+
+    client = FakeClient()
+    result = ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=client)
+
+    assert failing.stages == ["stage1"] and not client.stages
+    assert 2 in client.parts and 1 not in client.parts
+    assert result.parts_uploaded == result.parts - 1
+
+    again = ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=client)
+    assert again.dataset_id == result.dataset_id
+    assert again.archive_path is None
+    assert not list((cache_root / "ingest" / "archives").iterdir())
+
+
+def test_ingest_does_not_finalize_twice(cache_root, corpus, datasets, monkeypatch):
+    def fail(stage_id, use_cases=None):
+        raise dr.errors.ServerError("unavailable", 503)
+
+    client = FakeClient()
+    with monkeypatch.context() as m:
+        m.setattr(dr.Dataset, "create_from_datastage", fail)
+        with pytest.raises(dr.errors.ServerError):
+            ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=client)
+
+    result = ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=client)
+
+    assert client.finalized == ["stage1"]
+    assert result.dataset_id == "dataset-stage1"
+
+
+def test_ingest_restarts_when_the_stage_is_gone(cache_root, corpus, datasets):
+    failing = FakeClient(fail_parts=[2])
+    with pytest.raises(RuntimeError):
+        ingest.ingest_dataset(
+            str(corpus), max_part_bytes=4096, max_workers=1, client=failing
+        )
+
+    client = FakeClient(gone_stages=["stage1"])
+    client.stages = ["stage1"]
+    result = ingest.ingest_dataset(str(corpus), max_part_bytes=4096, client=client)
+
+    assert result.dataset_id == "dataset-stage2"
+    assert client.finalized == ["stage2"]
+    assert sorted(client.parts) == list(range(1, result.parts + 1))
@@ -0,0 +1,57 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import asyncio
+
+import pandas as pd
+
+from infra.common import keep_warm
+from infra.common.keep_warm import KeepWarmScheduler
+
+
+class FakePredictionClient:
+    def __init__(self):
+        self.calls = []
+
+    async def predict(self, deployment_id, data):
+        self.calls.append(deployment_id)
+
+    def close(self):
+        pass
+
+
+def test_payload_failure_is_isolated_and_retried(monkeypatch):
+    attempts = []
+
+    def synthetic_payload(deployment_id):
+        attempts.append(deployment_id)
+        if deployment_id == "broken" and attempts.count("broken") == 1:
+            raise RuntimeError("deployment not found")
+        return pd.DataFrame({"ping": [0]})
+
+    monkeypatch.setattr(keep_warm, "synthetic_payload", synthetic_payload)
+    client = FakePredictionClient()
+    scheduler = KeepWarmScheduler(
+        ["healthy", "broken"], interval=0, jitter=0, prediction_client=client
+    )
+
+    # A private loop; asyncio.run would unset the loop Pulumi mocks rely on.
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(scheduler.run(rounds=2))
+    finally:
+        loop.close()
+
+    assert client.calls.count("healthy") == 2
+    assert client.calls.count("broken") == 1
+    assert attempts.count("broken") == 2
+    assert attempts.count("healthy") == 1
+    assert scheduler.stats["broken"].errors == 1
+    assert scheduler.stats["broken"].pings == 2
+    assert scheduler.stats["healthy"].errors == 0
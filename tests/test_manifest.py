@@ -0,0 +1,196 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import os
+
+import pulumi
+import pytest
+
+from infra.common import stack_state
+from infra.common.manifest import (
+    ContentManifest,
+    ContentTracker,
+    corpus_digest,
+    corpus_manifest,
+    list_files,
+)
+
+
+class StackMocks(pulumi.runtime.Mocks):
+    """Mocks whose previous stack outputs are ``outputs``."""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+
+    def new_resource(self, args):
+        return [f"{args.name}-id", args.inputs]
+
+    def call(self, args):
+        assert args.token == "pulumi:pulumi:readStackOutputs"
+        return {"name": args.args["name"], "outputs": self.outputs}
+
+
+@pytest.fixture
+def previous_outputs():
+    """Set the outputs the last deployment of the mocked stack recorded."""
+
+    def set_outputs(outputs):
+        stack_state.previous_outputs.cache_clear()
+        pulumi.runtime.set_mocks(StackMocks(outputs), "project", "stack")
+
+    yield set_outputs
+    stack_state.previous_outputs.cache_clear()
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    root = tmp_path / "model"
+    (root / "sub").mkdir(parents=True)
+    (root / "custom.py").write_text("def score(): pass\n")
+    (root / "sub" / "data.txt").write_text("data")
+    return root
+
+
+def test_list_files_merges_folder_and_files(model_dir, tmp_path):
+    extra = tmp_path / "extra.txt"
+    extra.write_text("extra")
+
+    assert [remote for _, remote in list_files(str(model_dir), [(extra, "a.txt")])] == [
+        "a.txt",
+        "custom.py",
+        "sub/data.txt",
+    ]
+
+
+def test_manifest_only_rehashes_changed_files(cache_root, model_dir):
+    first = ContentManifest(folder_path=str(model_dir))
+    assert first.hashed == 2
+
+    unchanged = ContentManifest(folder_path=str(model_dir))
+    assert unchanged.hashed == 0
+    assert unchanged.digest == first.digest
+
+    (model_dir / "custom.py").write_text("def score(): return 1\n")
+    changed = ContentManifest(folder_path=str(model_dir))
+    assert changed.hashed == 1
+    assert changed.digest != first.digest
+
+
+def test_manifest_rehashes_when_mtime_is_pinned(cache_root, model_dir):
+    path = model_dir / "custom.py"
+    first = ContentManifest(folder_path=str(model_dir))
+    stat = path.stat()
+
+    path.write_text("def score(): return 2\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert ContentManifest(folder_path=str(model_dir)).digest != first.digest
+
+
+def test_digest_ignores_location_and_stat_times(cache_root, model_dir, tmp_path):
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    for local, remote in list_files(str(model_dir)):
+        (copy / remote).parent.mkdir(parents=True, exist_ok=True)
+        (copy / remote).write_bytes(open(local, "rb").read())
+
+    assert (
+        ContentManifest(folder_path=str(copy)).digest
+        == ContentManifest(folder_path=str(model_dir)).digest
+    )
+
+
+def test_tracker_ignores_files_deployed_by_the_stack(
+    cache_root, model_dir, previous_outputs
+):
+    digest = ContentManifest(folder_path=str(model_dir)).digest
+    previous_outputs(
+        {stack_state.STATE_OUTPUT: {"test:index:Model::model:contentDigest": digest}}
+    )
+
+    tracker = ContentTracker("test:index:Model", "model", folder_path=str(model_dir))
+
+    assert tracker.unchanged
+    assert tracker.ignore_changes == ["folderPath", "files"]
+
+
+def test_tracker_ships_content_the_stack_does_not_hold(
+    cache_root, model_dir, previous_outputs
+):
+    # Another machine deployed different content to the same stack.
+    previous_outputs(
+        {
+            stack_state.STATE_OUTPUT: {
+                "test:index:Model::model:contentDigest": "deployed-elsewhere"
+            }
+        }
+    )
+    assert (
+        ContentTracker(
+            "test:index:Model", "model", folder_path=str(model_dir)
+        ).ignore_changes
+        == []
+    )
+
+    # A stack that never recorded a digest is never assumed to be current.
+    previous_outputs({})
+    assert (
+        ContentTracker(
+            "test:index:Model", "model", folder_path=str(model_dir)
+        ).ignore_changes
+        == []
+    )
+
+
+@pulumi.runtime.test
+def test_tracker_records_digests_in_one_namespaced_output(
+    cache_root, model_dir, tmp_path, monkeypatch, previous_outputs
+):
+    previous_outputs({})
+    exported = {}
+    monkeypatch.setattr(pulumi, "export", exported.__setitem__)
+    monkeypatch.setattr(stack_state, "_recorded", {})
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / "custom.py").write_text("def score(): return 1\n")
+
+    # Same resource name, different resource types.
+    model = ContentTracker("test:index:Model", "model", folder_path=str(model_dir))
+    other = ContentTracker("test:index:Other", "model", folder_path=str(other_dir))
+    model.record(pulumi.Output.from_input("model-id"))
+    other.record(pulumi.Output.from_input("other-id"))
+
+    assert list(exported) == [stack_state.STATE_OUTPUT]
+
+    def check(state):
+        assert state == {
+            "test:index:Model::model:contentDigest": model.manifest.digest,
+            "test:index:Other::model:contentDigest": other.manifest.digest,
+        }
+
+    return pulumi.Output.all(**exported[stack_state.STATE_OUTPUT]).apply(check)
+
+
+def test_corpus_digest_ignores_file_name_and_location(cache_root, tmp_path):
+    corpus = tmp_path / "corpus.zip"
+    corpus.write_bytes(b"documents")
+    moved = tmp_path / "elsewhere" / "renamed.zip"
+    moved.parent.mkdir()
+    moved.write_bytes(b"documents")
+
+    assert corpus_digest(str(corpus)) == corpus_digest(str(moved))
+    assert corpus_digest(str(corpus)) == corpus_manifest(str(corpus)).digest
+
+
+def test_corpus_digest_of_directories(cache_root, model_dir, tmp_path):
+    assert (
+        corpus_digest(str(model_dir))
+        == ContentManifest(folder_path=str(model_dir)).digest
+    )
+    assert corpus_digest(str(model_dir)) != corpus_digest(str(model_dir / "custom.py"))
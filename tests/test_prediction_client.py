@@ -0,0 +1,130 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import asyncio
+import threading
+import time
+import types
+
+import datarobot as dr
+import pandas as pd
+import pytest
+import requests
+
+from infra.common.prediction_client import AsyncPredictionClient, DeploymentEndpoint
+
+
+class StubSession:
+    """Transport answering every POST with ``answer(url)`` after ``delay`` seconds."""
+
+    def __init__(self, answer, delay=0.0):
+        self.answer = answer
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, data, headers, timeout):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return self.answer(url)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+
+def csv_response(url):
+    return types.SimpleNamespace(
+        status_code=200,
+        headers={"Content-Type": "text/csv; charset=utf-8"},
+        content=b"prediction\n42\n",
+        text="prediction\n42\n",
+    )
+
+
+def client_with(session, max_concurrency=4):
+    client = AsyncPredictionClient(max_concurrency=max_concurrency)
+    client._session = session
+    client._endpoints["d"] = DeploymentEndpoint("https://predict/d", {})
+    return client
+
+
+def run(coroutine):
+    # Not asyncio.run, which leaves the main thread without an event loop.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_predict_records_latency():
+    client = client_with(StubSession(csv_response))
+
+    response = run(client.predict("d", pd.DataFrame({"x": [1]})))
+    client.close()
+
+    assert response.dataframe["prediction"].tolist() == [42]
+    summary = client.latency_summary()
+    assert summary["requests"] == 1 and summary["errors"] == 0
+
+
+@pytest.mark.parametrize(
+    "status_code, error_type",
+    [(429, dr.errors.ClientError), (503, dr.errors.ServerError)],
+)
+def test_http_errors_are_counted(status_code, error_type):
+    def answer(url):
+        return types.SimpleNamespace(
+            status_code=status_code, headers={}, content=b"", text="busy"
+        )
+
+    client = client_with(StubSession(answer))
+
+    with pytest.raises(error_type, match="busy"):
+        run(client.predict("d", "x\n1\n"))
+    client.close()
+
+    assert client.latency_summary() == {"requests": 0, "errors": 1}
+
+
+@pytest.mark.parametrize(
+    "error", [requests.Timeout("timed out"), requests.ConnectionError("reset")]
+)
+def test_transport_errors_are_counted(error):
+    def answer(url):
+        raise error
+
+    client = client_with(StubSession(answer))
+
+    with pytest.raises(type(error)):
+        run(client.predict("d", "x\n1\n"))
+    client.close()
+
+    assert client.latency_summary() == {"requests": 0, "errors": 1}
+
+
+def test_concurrency_is_bounded():
+    session = StubSession(csv_response, delay=0.02)
+    client = client_with(session, max_concurrency=3)
+
+    async def burst():
+        await asyncio.gather(*(client.predict("d", "x\n1\n") for _ in range(12)))
+
+    run(burst())
+    client.close()
+
+    assert session.max_in_flight == 3
+    assert client.latency_summary()["requests"] == 12
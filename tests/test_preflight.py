@@ -0,0 +1,153 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import time
+
+import pulumi
+import pulumi_datarobot as datarobot
+import pytest
+
+from infra.common.globals import GlobalLLM
+from infra.common.preflight import PreflightValidator
+from infra.common.runtime_catalog import (
+    CatalogEnvironment,
+    RuntimeEnvironmentCatalog,
+    RuntimeEnvironmentVersion,
+)
+from infra.common.schema import (
+    CustomModelArgs,
+    LLMBlueprintArgs,
+    LLMSettings,
+    VectorDatabaseSettings,
+)
+
+PYTHON = "[DataRobot] Python 3.11"
+
+
+@pytest.fixture
+def catalog():
+    return RuntimeEnvironmentCatalog(
+        synced_at=time.time(),
+        environments=[
+            CatalogEnvironment(
+                id="env1",
+                name=PYTHON,
+                versions=[RuntimeEnvironmentVersion(id="v1")],
+            ),
+            CatalogEnvironment(
+                id="env2",
+                name="[DataRobot] R 4.2",
+                versions=[RuntimeEnvironmentVersion(id="v2")],
+            ),
+        ],
+    )
+
+
+def custom_model_args(**kwargs):
+    return CustomModelArgs(
+        **{
+            "resource_name": "custom-model",
+            "name": "Custom Model",
+            "base_environment_id": "env1",
+            "base_environment_name": PYTHON,
+            **kwargs,
+        }
+    )
+
+
+def llm_blueprint_args(llm_id):
+    return LLMBlueprintArgs(
+        resource_name="blueprint",
+        name="Blueprint",
+        llm_id=llm_id,
+        llm_settings=LLMSettings(max_completion_length=256, system_prompt=""),
+        vector_database_settings=VectorDatabaseSettings(),
+    )
+
+
+def test_valid_args_pass(catalog):
+    validator = PreflightValidator(catalog).add(
+        custom_model_args(base_environment_version_id="v1"),
+        llm_blueprint_args(GlobalLLM.AZURE_OPENAI_GPT_4),
+    )
+
+    assert validator.errors() == []
+    validator.check()
+
+
+def test_environment_checks(catalog):
+    errors = (
+        PreflightValidator(catalog)
+        .add(
+            custom_model_args(resource_name="stale", base_environment_id="gone"),
+            custom_model_args(resource_name="renamed", base_environment_name="Other"),
+            custom_model_args(
+                resource_name="foreign", base_environment_version_id="v2"
+            ),
+        )
+        .errors()
+    )
+
+    assert len(errors) == 3
+    assert "CustomModelArgs(stale): unknown base_environment_id 'gone'" in errors[0]
+    assert "'env1'" in errors[0]
+    assert "does not match" in errors[1]
+    assert "'v2' is not a version" in errors[2]
+
+
+def test_environment_checks_need_catalog():
+    assert PreflightValidator().add(custom_model_args()).errors() == []
+
+
+def test_available_llms():
+    errors = (
+        PreflightValidator(available_llms=[GlobalLLM.AZURE_OPENAI_GPT_4.value])
+        .add(
+            llm_blueprint_args(GlobalLLM.AZURE_OPENAI_GPT_4),
+            llm_blueprint_args(GlobalLLM.AZURE_OPENAI_GPT_4_TURBO),
+        )
+        .errors()
+    )
+
+    assert errors == [
+        "LLMBlueprintArgs(blueprint): LLM 'azure-openai-gpt-4-turbo' is not "
+        "available on this account"
+    ]
+
+
+def test_raw_provider_args_enum_values():
+    errors = (
+        PreflightValidator(available_llms=["azure-openai-gpt-4"])
+        .add(
+            datarobot.LlmBlueprintArgs(llm_id="gpt-9", playground_id="p"),
+            datarobot.LlmBlueprintArgs(
+                llm_id="azure-openai-gpt-4-32k", playground_id="p"
+            ),
+            datarobot.PredictionEnvironmentArgs(platform="mainframe"),
+            datarobot.PredictionEnvironmentArgs(platform=pulumi.Output.from_input("x")),
+        )
+        .errors()
+    )
+
+    assert len(errors) == 3
+    assert "'gpt-9' is not a valid GlobalLLM" in errors[0]
+    assert "'azure-openai-gpt-4-32k' is not available" in errors[1]
+    assert "'mainframe' is not a valid GlobalPredictionEnvironmentPlatforms" in (
+        errors[2]
+    )
+
+
+def test_check_raises_with_every_error(monkeypatch):
+    monkeypatch.setattr(pulumi, "error", lambda message: None)
+    validator = PreflightValidator().add(
+        datarobot.PredictionEnvironmentArgs(platform="mainframe"), object()
+    )
+
+    with pytest.raises(pulumi.RunError, match="2 error"):
+        validator.check()
@@ -0,0 +1,121 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import itertools
+import types
+
+import datarobot as dr
+import pytest
+import requests
+
+from infra.common.readiness import (
+    backoff_delays,
+    retry_until_ready,
+    wait_for_deployments,
+    wait_until_ready,
+)
+
+STARTING = dr.errors.ServerError("Inference server is starting", 503)
+
+
+def responses(*items):
+    """A callable returning or raising ``items`` in turn, then the last one forever."""
+    items = iter(itertools.chain(items, itertools.repeat(items[-1])))
+
+    def call(*args):
+        item = next(items)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    return call
+
+
+@pytest.fixture
+def deployments(monkeypatch):
+    """Map deployment ids to the callables answering ``Deployment.get``."""
+    answers = {}
+    monkeypatch.setattr(
+        dr.Deployment, "get", lambda deployment_id: answers[deployment_id]()
+    )
+    return answers
+
+
+def status(value):
+    return types.SimpleNamespace(status=value)
+
+
+def test_backoff_delays_grow_to_the_cap_with_bounded_jitter():
+    delays = list(itertools.islice(backoff_delays(1.0, 8.0), 8))
+    nominal = [1, 2, 4, 8, 8, 8, 8, 8]
+
+    for delay, expected in zip(delays, nominal):
+        assert expected / 2 <= delay <= expected
+
+
+def test_retry_until_ready_retries_while_starting():
+    func = responses(STARTING, STARTING, "predictions")
+
+    assert retry_until_ready(func, initial_delay=0.001) == "predictions"
+
+
+def test_retry_until_ready_raises_other_errors_and_times_out():
+    with pytest.raises(dr.errors.ServerError, match="boom"):
+        retry_until_ready(responses(dr.errors.ServerError("boom", 500)))
+    with pytest.raises(TimeoutError):
+        retry_until_ready(responses(STARTING), timeout=0.01, initial_delay=0.001)
+
+
+def test_wait_until_ready(deployments):
+    deployments["d"] = responses(status("launching"), STARTING, status("active"))
+    probed = []
+
+    result = wait_until_ready("d", initial_delay=0.001, probe=probed.append)
+
+    assert result.ready and result.attempts == 3
+    assert probed == ["d"]
+
+
+def test_wait_until_ready_deadline(deployments):
+    deployments["d"] = responses(status("launching"))
+
+    result = wait_until_ready("d", timeout=0.02, initial_delay=0.001)
+
+    assert not result.ready
+    assert result.error.startswith("not ready after")
+
+
+def test_wait_until_ready_retries_transient_errors(deployments):
+    deployments["d"] = responses(
+        dr.errors.ClientError("not found", 404),
+        requests.ConnectionError("reset"),
+        status("active"),
+    )
+
+    assert wait_until_ready("d", initial_delay=0.001).ready
+
+    deployments["d"] = responses(requests.ConnectionError("reset"))
+    result = wait_until_ready("d", timeout=0.02, initial_delay=0.001)
+    assert "last error: reset" in result.error
+
+
+def test_wait_for_deployments_records_errors_per_deployment(deployments):
+    deployments["ok"] = responses(status("active"))
+    deployments["forbidden"] = responses(dr.errors.ClientError("forbidden", 403))
+    deployments["errored"] = responses(status("errored"))
+
+    results = wait_for_deployments(
+        ["ok", "forbidden", "errored"], timeout=1, raise_on_failure=False
+    )
+
+    assert results["ok"].ready
+    assert "forbidden" in results["forbidden"].error
+    assert results["errored"].error == "deployment is errored"
+    with pytest.raises(TimeoutError, match="forbidden"):
+        wait_for_deployments(["ok", "forbidden"], timeout=1)
@@ -0,0 +1,82 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import time
+
+import datarobot as dr
+import pytest
+
+from infra.common.runtime_catalog import (
+    CatalogEnvironment,
+    RuntimeEnvironmentCatalog,
+    RuntimeEnvironmentVersion,
+    snapshot_path,
+)
+
+
+@pytest.fixture
+def configured_client():
+    client = dr.rest.RESTClientObject(
+        auth="token", endpoint="https://app.example.com/api/v2/"
+    )
+    previous = dr.client.set_client(client)
+    yield client
+    dr.client.set_client(previous)
+
+
+def make_catalog(endpoint):
+    return RuntimeEnvironmentCatalog(
+        synced_at=time.time(),
+        endpoint=endpoint,
+        environments=[
+            CatalogEnvironment(
+                id="env1",
+                name="[DataRobot] Python 3.11",
+                latest_version_id="v2",
+                versions=[
+                    RuntimeEnvironmentVersion(id="v1"),
+                    RuntimeEnvironmentVersion(id="v2"),
+                ],
+            )
+        ],
+    )
+
+
+def test_lookups():
+    catalog = make_catalog("https://app.example.com/api/v2")
+
+    assert "env1" in catalog
+    assert catalog.latest_version_id("env1") == "v2"
+    assert catalog.environment_of_version("v1") == "env1"
+    assert catalog.resolve("stale", name="[DataRobot] Python 3.11").id == "env1"
+    with pytest.raises(KeyError):
+        catalog.resolve("stale", name="missing")
+
+
+def test_save_then_load_default_path(cache_root, configured_client):
+    # sync() records the client endpoint, trailing slash and all.
+    make_catalog(configured_client.endpoint).save()
+
+    loaded = RuntimeEnvironmentCatalog.load()
+
+    assert loaded is not None
+    assert loaded.get("env1").name == "[DataRobot] Python 3.11"
+
+
+def test_snapshot_path_ignores_trailing_slash(cache_root):
+    assert snapshot_path("https://app.example.com/api/v2/") == snapshot_path(
+        "https://app.example.com/api/v2"
+    )
+
+
+def test_load_respects_max_age(cache_root, configured_client):
+    path = make_catalog(configured_client.endpoint).save()
+
+    assert RuntimeEnvironmentCatalog.load(path, max_age=3600) is not None
+    assert RuntimeEnvironmentCatalog.load(path, max_age=-1) is None
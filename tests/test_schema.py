@@ -0,0 +1,140 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import pulumi_datarobot as datarobot
+import pytest
+from pydantic import ValidationError
+
+from infra.common.globals import DeploymentProfile, GlobalDeploymentProfile
+from infra.common.schema import (
+    ChunkingParameters,
+    DeploymentArgs,
+    required_computes,
+)
+
+
+def test_required_computes():
+    assert required_computes(0, 1.0) == 1
+    assert required_computes(10, 0.5) == 5
+    assert required_computes(10, 0.55) == 6
+    assert required_computes(10, 0.5, concurrency_per_compute=2) == 3
+
+
+def test_from_profile_applies_settings():
+    args = DeploymentArgs.from_profile(
+        GlobalDeploymentProfile.LOW_LATENCY_REALTIME, "deployment", "Deployment"
+    )
+
+    assert args.resource_name == "deployment"
+    assert args.predictions_settings.real_time is True
+    assert args.predictions_settings.min_computes == 1
+    assert args.predictions_settings.max_computes == 4
+    assert args.predictions_data_collection_settings.enabled is False
+    assert args.drift_tracking_settings.feature_drift_enabled is False
+    assert args.drift_tracking_settings.target_drift_enabled is True
+    assert args.challenger_models_settings.enabled is False
+
+
+def test_from_profile_overrides():
+    health = datarobot.DeploymentHealthSettingsArgs()
+    args = DeploymentArgs.from_profile(
+        GlobalDeploymentProfile.COST_MINIMAL,
+        "deployment",
+        "Deployment",
+        importance="LOW",
+        health_settings=health,
+    )
+
+    assert args.importance == "LOW"
+    assert args.health_settings is health
+    assert args.predictions_settings.max_computes == 1
+
+
+def test_from_profile_checks_capacity():
+    profile = GlobalDeploymentProfile.LOW_LATENCY_REALTIME
+
+    DeploymentArgs.from_profile(
+        profile,
+        "deployment",
+        "Deployment",
+        peak_requests_per_second=8,
+        latency_seconds=0.5,
+    )
+    with pytest.raises(ValueError, match="needs 5 computes"):
+        DeploymentArgs.from_profile(
+            profile,
+            "deployment",
+            "Deployment",
+            peak_requests_per_second=10,
+            latency_seconds=0.5,
+        )
+
+
+def test_from_custom_profile():
+    profile = DeploymentProfile(
+        real_time=True,
+        min_computes=2,
+        max_computes=2,
+        data_collection=True,
+        feature_drift=True,
+        target_drift=True,
+        challengers=True,
+    )
+
+    args = DeploymentArgs.from_profile(profile, "deployment", "Deployment")
+
+    assert args.predictions_settings.min_computes == 2
+    assert args.challenger_models_settings.enabled is True
+
+
+@pytest.mark.parametrize("min_computes, max_computes", [(-1, 1), (0, 0), (3, 2)])
+def test_deployment_args_rejects_invalid_computes(min_computes, max_computes):
+    settings = datarobot.DeploymentPredictionsSettingsArgs(
+        real_time=True, min_computes=min_computes, max_computes=max_computes
+    )
+
+    with pytest.raises(ValidationError, match="Invalid predictions_settings"):
+        DeploymentArgs(
+            resource_name="deployment",
+            label="Deployment",
+            predictions_settings=settings,
+        )
+
+
+@pytest.mark.parametrize(
+    "overrides, message",
+    [
+        ({"min_computes": 3, "max_computes": 2}, "exceeds"),
+        ({"challengers": True, "data_collection": False}, "Challenger"),
+        ({"max_computes": 0}, "greater than or equal to 1"),
+    ],
+)
+def test_deployment_profile_rejects_invalid_settings(overrides, message):
+    settings = dict(
+        real_time=True,
+        min_computes=0,
+        max_computes=1,
+        data_collection=False,
+        feature_drift=False,
+        target_drift=False,
+    )
+
+    with pytest.raises(ValidationError, match=message):
+        DeploymentProfile(**{**settings, **overrides})
+
+
+def test_chunking_parameters_coerce_sdk_enums():
+    from datarobot.enums import VectorDatabaseChunkingMethod
+
+    parameters = ChunkingParameters(chunking_method="recursive", chunk_size=256)
+
+    assert parameters.chunking_method is VectorDatabaseChunkingMethod.RECURSIVE
+    assert parameters.embedding_model is None
+    with pytest.raises(ValidationError):
+        ChunkingParameters(chunking_method="unknown", chunk_size=256)
@@ -0,0 +1,54 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import pytest
+
+from infra.common.upload import batch_files
+
+
+@pytest.fixture
+def make_files(tmp_path):
+    def make(**sizes):
+        files = []
+        for name, size in sizes.items():
+            path = tmp_path / name
+            path.write_bytes(b"x" * size)
+            files.append((str(path), f"model/{name}"))
+        return files
+
+    return make
+
+
+def remotes(batches):
+    return [[remote for _, remote in batch] for batch in batches]
+
+
+def test_batches_respect_the_size_limit(make_files):
+    files = make_files(a=40, b=30, c=20, d=10)
+
+    batches = batch_files(files, max_batch_bytes=60)
+
+    assert remotes(batches) == [["model/d", "model/c", "model/b"], ["model/a"]]
+    assert sorted(pair for batch in batches for pair in batch) == sorted(files)
+
+
+def test_oversized_file_gets_its_own_batch(make_files):
+    files = make_files(small=10, huge=500)
+
+    assert remotes(batch_files(files, max_batch_bytes=100)) == [
+        ["model/small"],
+        ["model/huge"],
+    ]
+
+
+def test_everything_fits_in_one_batch(make_files):
+    files = make_files(a=1, b=2)
+
+    assert len(batch_files(files)) == 1
+    assert batch_files([]) == []
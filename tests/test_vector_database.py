@@ -0,0 +1,205 @@
+# Copyright 2024 DataRobot, Inc. and its affiliates.
+# All rights reserved.
+# DataRobot, Inc.
+# This is proprietary source code of DataRobot, Inc. and its
+# affiliates.
+# Released under the terms of DataRobot Tool and Utility Agreement.
+
+# mypy: ignore-errors
+
+import zipfile
+
+import datarobot as dr
+import pytest
+
+from infra.common import manifest, vector_database
+from infra.common.vector_database import (
+    _VectorDatabaseVersionProvider,
+    document_index,
+    documents_digest,
+)
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """Vector database API where every build completes immediately."""
+
+    def __init__(self):
+        self.vector_databases = {"base": {"datasetId": "d0"}}
+        self.created = []
+        self.deleted = []
+        self.renamed = []
+
+    def get(self, url):
+        vector_database_id = url.rstrip("/").rsplit("/", 1)[-1]
+        return FakeResponse(
+            {
+                **self.vector_databases[vector_database_id],
+                "executionStatus": "COMPLETED",
+            }
+        )
+
+    def post(self, url, json):
+        vector_database_id = f"v{len(self.created) + 1}"
+        self.vector_databases[vector_database_id] = json
+        self.created.append(json)
+        return FakeResponse({"id": vector_database_id})
+
+    def patch(self, url, json):
+        vector_database_id = url.rstrip("/").rsplit("/", 1)[-1]
+        self.vector_databases[vector_database_id].update(json)
+        self.renamed.append((vector_database_id, json["name"]))
+
+    def delete(self, url):
+        vector_database_id = url.rstrip("/").rsplit("/", 1)[-1]
+        if vector_database_id not in self.vector_databases:
+            raise dr.errors.ClientError("not found", 404)
+        del self.vector_databases[vector_database_id]
+        self.deleted.append(vector_database_id)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(dr.client, "get_client", lambda: client)
+    return client
+
+
+def props(dataset_id, digest):
+    return {
+        "base_vector_database_id": "base",
+        "dataset_id": dataset_id,
+        "documents_digest": digest,
+        "name": "docs",
+    }
+
+
+def test_create_reuses_base_built_from_the_dataset(client):
+    outs = _VectorDatabaseVersionProvider().create(props("d0", "a")).outs
+
+    assert outs["vector_database_id"] == "base"
+    assert outs["version_ids"] == []
+    assert client.created == []
+
+
+def test_create_builds_version_for_another_dataset(client):
+    # e.g. a stack whose base predates the version resource.
+    outs = _VectorDatabaseVersionProvider().create(props("d1", "b")).outs
+
+    assert outs["vector_database_id"] == "v1"
+    assert client.created[0]["parentVectorDatabaseId"] == "base"
+    assert client.created[0]["datasetId"] == "d1"
+
+
+def test_changed_documents_chain_versions(client):
+    provider = _VectorDatabaseVersionProvider()
+    olds = provider.create(props("d0", "a")).outs
+
+    news = props("d1", "b")
+    assert provider.diff("id", olds, news).changes
+    olds = provider.update("id", olds, news).outs
+    olds = provider.update("id", olds, props("d2", "c")).outs
+
+    assert olds["vector_database_id"] == "v2"
+    assert olds["version_ids"] == ["v1", "v2"]
+    assert [payload["parentVectorDatabaseId"] for payload in client.created] == [
+        "base",
+        "v1",
+    ]
+
+
+def test_reuploaded_identical_documents_create_no_version(client):
+    provider = _VectorDatabaseVersionProvider()
+    olds = provider.create(props("d0", "a")).outs
+
+    outs = provider.update("id", olds, props("d1", "a")).outs
+
+    assert outs["vector_database_id"] == "base"
+    assert outs["dataset_id"] == "d1"
+    assert client.created == []
+
+
+def test_diff():
+    provider = _VectorDatabaseVersionProvider()
+    olds = {**props("d0", "a"), "vector_database_id": "base", "version_ids": []}
+
+    assert not provider.diff("id", olds, props("d0", "a")).changes
+    replaced = provider.diff(
+        "id", olds, {**props("d0", "a"), "base_vector_database_id": "other"}
+    )
+    assert replaced.replaces == ["base_vector_database_id"]
+    renamed = provider.diff("id", olds, {**props("d0", "a"), "name": "new docs"})
+    assert renamed.changes and not renamed.replaces
+
+
+def test_rename_reaches_the_latest_version(client):
+    provider = _VectorDatabaseVersionProvider()
+    olds = provider.create(props("d0", "a")).outs
+    olds = provider.update("id", olds, {**props("d0", "a"), "name": "new docs"}).outs
+    assert client.renamed == []  # the base belongs to its own resource
+
+    olds = provider.update("id", olds, props("d1", "b")).outs
+    provider.update("id", olds, {**props("d1", "b"), "name": "new docs"})
+
+    assert client.renamed == [("v1", "new docs")]
+
+
+def test_delete_removes_created_versions_newest_first(client):
+    provider = _VectorDatabaseVersionProvider()
+    olds = provider.create(props("d0", "a")).outs
+    olds = provider.update("id", olds, props("d1", "b")).outs
+    olds = provider.update("id", olds, props("d2", "c")).outs
+    del client.vector_databases["v1"]  # already deleted out of band
+
+    provider.delete("id", olds)
+
+    assert client.deleted == ["v2"]
+    assert "base" in client.vector_databases
+
+
+def test_failed_build_raises(client, monkeypatch):
+    monkeypatch.setattr(
+        client,
+        "get",
+        lambda url: FakeResponse({"executionStatus": "ERROR", "errorMessage": "boom"}),
+    )
+
+    with pytest.raises(RuntimeError, match="boom"):
+        vector_database._wait_for_vector_database(client, "v1")
+
+
+def test_documents_digest_ignores_packaging(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("alpha")
+    (corpus / "b.txt").write_text("beta")
+    for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        with zipfile.ZipFile(tmp_path / f"{compression}.zip", "w", compression) as z:
+            z.write(corpus / "a.txt", "a.txt")
+            z.write(corpus / "b.txt", "b.txt")
+
+    assert sorted(document_index(str(tmp_path / "0.zip"))) == ["a.txt", "b.txt"]
+    assert documents_digest(str(tmp_path / "0.zip")) == documents_digest(
+        str(tmp_path / "8.zip")
+    )
+
+
+def test_document_index_reuses_manifest_hashes(cache_root, tmp_path, monkeypatch):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("documents")
+    first = document_index(str(corpus))
+
+    def hash_file(path):
+        raise AssertionError(f"{path} rehashed")
+
+    monkeypatch.setattr(manifest, "hash_file", hash_file)
+
+    assert document_index(str(corpus)) == first
+    assert list(first) == [manifest.CORPUS_FILE_NAME]